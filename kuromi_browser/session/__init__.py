@@ -24,7 +24,9 @@ Example usage:
             print(link.attr("href"))
 """
 
-from typing import TYPE_CHECKING, Optional
+import asyncio
+from collections import deque
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 from kuromi_browser.session.client import Session
 from kuromi_browser.session.element import SessionElement
@@ -49,12 +51,26 @@ class SessionPool:
             await pool.release(session)
     """
 
+    __slots__ = (
+        "_pool_size",
+        "_fingerprints",
+        "_proxies",
+        "_impersonate",
+        "_http_version",
+        "_sessions",
+        "_available",
+        "_fingerprint_index",
+        "_proxy_index",
+        "_response_pool",
+    )
+
     def __init__(
         self,
         pool_size: int = 10,
         fingerprints: Optional[list["Fingerprint"]] = None,
         proxies: Optional[list[str]] = None,
         impersonate: str = "chrome120",
+        http_version: Optional[str] = "h2",
     ) -> None:
         """Initialize SessionPool.
 
@@ -63,15 +79,18 @@ class SessionPool:
             fingerprints: Optional list of fingerprints to rotate.
             proxies: Optional list of proxy URLs to rotate.
             impersonate: Default browser to impersonate.
+            http_version: HTTP version for pooled sessions (see Session).
         """
         self._pool_size = pool_size
         self._fingerprints = fingerprints or []
         self._proxies = proxies or []
         self._impersonate = impersonate
+        self._http_version = http_version
         self._sessions: list[Session] = []
         self._available: list[Session] = []
         self._fingerprint_index = 0
         self._proxy_index = 0
+        self._response_pool: deque[Response] = deque(maxlen=pool_size * 2)
 
     def _get_next_fingerprint(self) -> Optional["Fingerprint"]:
         """Get the next fingerprint in rotation."""
@@ -108,7 +127,9 @@ class SessionPool:
                 fingerprint=self._get_next_fingerprint(),
                 proxy=self._get_next_proxy(),
                 impersonate=self._impersonate,
+                http_version=self._http_version,
             )
+            session._response_pool = self._response_pool
             self._sessions.append(session)
             return session
 
@@ -119,6 +140,7 @@ class SessionPool:
             fingerprint=self._get_next_fingerprint(),
             proxy=self._get_next_proxy(),
             impersonate=self._impersonate,
+            http_version=self._http_version,
         )
 
     async def release(self, session: Session) -> None:
@@ -130,12 +152,80 @@ class SessionPool:
         if session in self._sessions and session not in self._available:
             self._available.append(session)
 
+    async def gather(
+        self,
+        requests: list[Union[tuple[str, str], tuple[str, str, dict[str, Any]]]],
+        return_exceptions: bool = False,
+    ) -> list[Union[Response, BaseException]]:
+        """Perform a batch of requests concurrently on a single session.
+
+        All requests are issued through one session so they share its
+        curl_cffi client and multi handle. With the default
+        http_version="h2", requests to the same origin are multiplexed
+        as streams over one connection, so the TCP/TLS handshake is paid
+        once for the whole batch rather than once per request.
+
+        By default the batch fails fast: the first failing request
+        cancels the ones still running and its exception is raised.
+
+        Args:
+            requests: List of (method, url) or (method, url, kwargs)
+                tuples. kwargs are passed to Session.request.
+            return_exceptions: Let every request finish and put the
+                exception of a failed request in its slot of the result
+                instead of raising it.
+
+        Returns:
+            List of responses (or exceptions, with return_exceptions) in
+            the same order as requests.
+
+        Example:
+            responses = await pool.gather([
+                ("GET", "https://example.com/a"),
+                ("GET", "https://example.com/b", {"params": {"page": 2}}),
+            ])
+        """
+        if not requests:
+            return []
+
+        session = await self.acquire()
+        try:
+            tasks = []
+            for method, url, *extra in requests:
+                kwargs = extra[0] if extra else {}
+                tasks.append(asyncio.ensure_future(session.request(method, url, **kwargs)))
+            try:
+                return list(
+                    await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+                )
+            except BaseException:
+                # Do not leave the other requests running on a session
+                # that is about to be released
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+        finally:
+            if session in self._sessions:
+                await self.release(session)
+            else:
+                # A temporary session from a full pool is not tracked, so
+                # close its client here instead of leaking it
+                await session.close()
+
     async def close_all(self) -> None:
-        """Close all sessions in the pool."""
-        for session in self._sessions:
-            await session.close()
+        """Close all sessions in the pool.
+
+        Sessions are closed concurrently; a failure closing one session
+        does not prevent the others from being closed.
+        """
+        await asyncio.gather(
+            *(session.close() for session in self._sessions),
+            return_exceptions=True,
+        )
         self._sessions.clear()
         self._available.clear()
+        self._response_pool.clear()
 
     @property
     def size(self) -> int:
@@ -4,15 +4,162 @@ Session element wrapper for HTML parsing.
 Provides a DOM-like interface for elements parsed from HTTP responses using lxml.
 """
 
-from typing import TYPE_CHECKING, Optional, Union
+from functools import lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Optional, Union
 import re
 
 from lxml import html
-from lxml.etree import _Element, tostring
+from lxml.etree import XPath, _Element, tostring
 
 if TYPE_CHECKING:
     from lxml.cssselect import CSSSelector
 
+# Attribute-axis queries return the values directly as plain strings
+_HREF_XPATH = XPath(".//a/@href", smart_strings=False)
+_SRC_XPATH = XPath(".//img/@src", smart_strings=False)
+
+# User values are bound as XPath variables, so one compiled expression
+# serves every value and quotes in the value cannot break the query
+# Any direct text node may match, not just the first one
+_TEXT_CONTAINS_XPATH = XPath(".//*[text()[contains(., $t)]]")
+_ATTR_NAME_RE = re.compile(r"[A-Za-z_][\w:.-]*\Z")
+
+
+@lru_cache(maxsize=256)
+def _compiled_css(selector: str) -> "CSSSelector":
+    """Compile a CSS selector once and reuse it.
+
+    Uses the HTML translator, matching HtmlElement.cssselect().
+
+    Args:
+        selector: CSS selector.
+
+    Returns:
+        Compiled selector callable on an element.
+    """
+    from lxml.cssselect import CSSSelector
+
+    return CSSSelector(selector, translator="html")
+
+
+@lru_cache(maxsize=256)
+def _compiled_xpath(expression: str) -> XPath:
+    """Compile an XPath expression once and reuse it.
+
+    Args:
+        expression: XPath expression.
+
+    Returns:
+        Compiled XPath callable on an element.
+    """
+    return XPath(expression)
+
+
+@lru_cache(maxsize=64)
+def _attr_equals_xpath(name: str) -> Optional[XPath]:
+    """Compile an attribute equality query for an attribute name.
+
+    Args:
+        name: Attribute name.
+
+    Returns:
+        Compiled XPath taking the value as $v, or None if the name is
+        not a valid attribute name.
+    """
+    if not _ATTR_NAME_RE.match(name):
+        return None
+    return XPath(f".//*[@{name}=$v]")
+
+
+def _explicit_prefix_parser(
+    selector_type: str, long_prefix: str
+) -> Callable[[str], tuple[str, str]]:
+    """Build a parser for a "<long_prefix>" / "<letter>:" selector prefix.
+
+    Args:
+        selector_type: Type returned when the prefix matches.
+        long_prefix: Long form of the prefix, e.g. "css:".
+
+    Returns:
+        Parser returning (selector_type, cleaned_selector), or a CSS
+        selector if neither prefix form matches.
+    """
+    long_len = len(long_prefix)
+
+    def parse(selector: str) -> tuple[str, str]:
+        if selector[1:2] == ":":
+            return (selector_type, selector[2:].strip())
+        if selector[:long_len] == long_prefix:
+            return (selector_type, selector[long_len:].strip())
+        return ("css", selector)
+
+    return parse
+
+
+def _parse_slash(selector: str) -> tuple[str, str]:
+    """Parse a selector starting with "/" (XPath only if "//")."""
+    return ("xpath" if selector[1:2] == "/" else "css", selector)
+
+
+def _parse_paren(selector: str) -> tuple[str, str]:
+    """Parse a selector starting with "(" as XPath."""
+    return ("xpath", selector)
+
+
+def _parse_dot(selector: str) -> tuple[str, str]:
+    """Parse a selector starting with "." (XPath if "./", else class)."""
+    return ("xpath" if selector[1:2] == "/" else "css", selector)
+
+
+def _parse_attr(selector: str) -> tuple[str, str]:
+    """Parse a selector starting with "@" (attribute search if "=")."""
+    if "=" in selector:
+        return ("attr", selector[1:])
+    return ("css", selector)
+
+
+# Selector parsers keyed by the first character of the selector
+_PREFIX_DISPATCH: dict[str, Callable[[str], tuple[str, str]]] = {
+    "c": _explicit_prefix_parser("css", "css:"),
+    "x": _explicit_prefix_parser("xpath", "xpath:"),
+    "t": _explicit_prefix_parser("text", "text:"),
+    "/": _parse_slash,
+    "(": _parse_paren,
+    ".": _parse_dot,
+    "@": _parse_attr,
+}
+
+
+@lru_cache(maxsize=512)
+def _parse_selector(selector: str) -> tuple[str, str]:
+    """Parse selector and determine type (css, xpath, text, etc).
+
+    Selector prefixes:
+        - css: or c: -> CSS selector
+        - xpath: or x: -> XPath expression
+        - text: or t: -> Text content search
+        - @attr= -> Attribute search
+        - # -> ID search
+        - . -> Class search
+        - No prefix -> Auto-detect (CSS by default)
+
+    Parsing is deterministic, so results are cached by selector string.
+
+    Args:
+        selector: The selector string.
+
+    Returns:
+        Tuple of (selector_type, cleaned_selector).
+    """
+    selector = selector.strip()
+    handler = _PREFIX_DISPATCH.get(selector[:1])
+    if handler is not None:
+        return handler(selector)
+
+    # Default to CSS
+    return ("css", selector)
+
 
 class SessionElement:
     """Element wrapper for lxml elements.
@@ -21,6 +168,8 @@ class SessionElement:
     parsed from HTTP responses, similar to browser DOM elements.
     """
 
+    __slots__ = ("_element", "_classes")
+
     def __init__(self, element: _Element) -> None:
         """Initialize SessionElement.
 
@@ -28,6 +177,7 @@ class SessionElement:
             element: The lxml element to wrap.
         """
         self._element = element
+        self._classes: Optional[frozenset[str]] = None
 
     @property
     def tag(self) -> str:
@@ -57,16 +207,33 @@ class SessionElement:
     @property
     def inner_html(self) -> str:
         """Get the inner HTML of the element."""
-        parts = []
-        if self._element.text:
-            parts.append(self._element.text)
-        for child in self._element:
-            parts.append(tostring(child, encoding="unicode", method="html"))
-        return "".join(parts)
+        element = self._element
+        if not isinstance(element.tag, str):
+            # Comments and processing instructions only carry text
+            return element.text or ""
+        if not element.text and not len(element):
+            return ""
+
+        # Serialize the subtree in one pass and cut off the element's own
+        # tags; an empty copy of the element gives the exact open tag
+        outer = tostring(element, encoding="unicode", method="html", with_tail=False)
+        shell = tostring(
+            element.makeelement(element.tag, element.attrib),
+            encoding="unicode",
+            method="html",
+        )
+        close_start = shell.rfind("</")
+        if close_start == -1:
+            # Void element with children (only possible after tree edits)
+            return (element.text or "") + "".join(
+                tostring(child, encoding="unicode", method="html") for child in element
+            )
+        close_len = len(shell) - close_start
+        return outer[close_start : len(outer) - close_len]
 
     @property
     def attrs(self) -> dict[str, str]:
-        """Get all attributes as a dictionary."""
+        """Get all attributes as a new dictionary."""
         return dict(self._element.attrib)
 
     def attr(self, name: str, default: Optional[str] = None) -> Optional[str]:
@@ -124,51 +291,6 @@ class SessionElement:
             return SessionElement(sibling)
         return None
 
-    def _parse_selector(self, selector: str) -> tuple[str, str]:
-        """Parse selector and determine type (css, xpath, text, etc).
-
-        Selector prefixes:
-            - css: or c: -> CSS selector
-            - xpath: or x: -> XPath expression
-            - text: or t: -> Text content search
-            - @attr= -> Attribute search
-            - # -> ID search
-            - . -> Class search
-            - No prefix -> Auto-detect (CSS by default)
-
-        Args:
-            selector: The selector string.
-
-        Returns:
-            Tuple of (selector_type, cleaned_selector).
-        """
-        selector = selector.strip()
-
-        # Check for explicit prefixes
-        if selector.startswith(("css:", "c:")):
-            prefix_len = 4 if selector.startswith("css:") else 2
-            return ("css", selector[prefix_len:].strip())
-
-        if selector.startswith(("xpath:", "x:")):
-            prefix_len = 6 if selector.startswith("xpath:") else 2
-            return ("xpath", selector[prefix_len:].strip())
-
-        if selector.startswith(("text:", "t:")):
-            prefix_len = 5 if selector.startswith("text:") else 2
-            return ("text", selector[prefix_len:].strip())
-
-        # Check for XPath indicators
-        if selector.startswith(("/", "(", ".")):
-            if selector.startswith("./") or selector.startswith("//") or selector.startswith("("):
-                return ("xpath", selector)
-
-        # Attribute search: @attr=value
-        if selector.startswith("@") and "=" in selector:
-            return ("attr", selector[1:])
-
-        # Default to CSS
-        return ("css", selector)
-
     def ele(self, selector: str) -> Optional["SessionElement"]:
         """Find the first element matching the selector.
 
@@ -192,29 +314,31 @@ class SessionElement:
         Returns:
             List of matching elements.
         """
-        selector_type, clean_selector = self._parse_selector(selector)
+        selector_type, clean_selector = _parse_selector(selector)
 
         if selector_type == "xpath":
-            elements = self._element.xpath(clean_selector)
-        elif selector_type == "css":
-            elements = self._element.cssselect(clean_selector)
+            # Only user XPath can return strings or numbers besides elements
+            results = _compiled_xpath(clean_selector)(self._element)
+            return [SessionElement(el) for el in results if isinstance(el, _Element)]
+
+        if selector_type == "css":
+            elements = _compiled_css(clean_selector)(self._element)
         elif selector_type == "text":
             # Search for elements containing text
-            xpath = f".//*[contains(text(), '{clean_selector}')]"
-            elements = self._element.xpath(xpath)
+            elements = _TEXT_CONTAINS_XPATH(self._element, t=clean_selector)
         elif selector_type == "attr":
             # Parse @attr=value
             if "=" in clean_selector:
                 attr_name, attr_value = clean_selector.split("=", 1)
                 attr_value = attr_value.strip("\"'")
-                xpath = f".//*[@{attr_name}='{attr_value}']"
-                elements = self._element.xpath(xpath)
+                attr_xpath = _attr_equals_xpath(attr_name.strip())
+                elements = attr_xpath(self._element, v=attr_value) if attr_xpath else []
             else:
                 elements = []
         else:
             elements = []
 
-        return [SessionElement(el) for el in elements if isinstance(el, _Element)]
+        return [SessionElement(el) for el in elements]
 
     def xpath(self, expression: str) -> list["SessionElement"]:
         """Execute XPath expression.
@@ -225,7 +349,7 @@ class SessionElement:
         Returns:
             List of matching elements.
         """
-        results = self._element.xpath(expression)
+        results = _compiled_xpath(expression)(self._element)
         return [SessionElement(el) for el in results if isinstance(el, _Element)]
 
     def css(self, selector: str) -> list["SessionElement"]:
@@ -237,7 +361,7 @@ class SessionElement:
         Returns:
             List of matching elements.
         """
-        results = self._element.cssselect(selector)
+        results = _compiled_css(selector)(self._element)
         return [SessionElement(el) for el in results]
 
     def has_class(self, class_name: str) -> bool:
@@ -249,8 +373,9 @@ class SessionElement:
         Returns:
             True if element has the class.
         """
-        classes = self._element.get("class", "").split()
-        return class_name in classes
+        if self._classes is None:
+            self._classes = frozenset(self._element.get("class", "").split())
+        return class_name in self._classes
 
     @property
     def classes(self) -> list[str]:
@@ -268,11 +393,7 @@ class SessionElement:
         Returns:
             List of href values.
         """
-        return [
-            el.get("href")
-            for el in self._element.xpath(".//a[@href]")
-            if el.get("href")
-        ]
+        return [href for href in _HREF_XPATH(self._element) if href]
 
     def images(self) -> list[str]:
         """Get all src values from descendant <img> elements.
@@ -280,15 +401,13 @@ class SessionElement:
         Returns:
             List of src values.
         """
-        return [
-            el.get("src")
-            for el in self._element.xpath(".//img[@src]")
-            if el.get("src")
-        ]
+        return [src for src in _SRC_XPATH(self._element) if src]
 
     def __repr__(self) -> str:
         """String representation of the element."""
-        attrs = " ".join(f'{k}="{v}"' for k, v in list(self.attrs.items())[:3])
+        attrs = " ".join(
+            f'{k}="{v}"' for k, v in islice(self._element.attrib.items(), 3)
+        )
         if attrs:
             return f"<SessionElement <{self.tag} {attrs}...>>"
         return f"<SessionElement <{self.tag}>>"
@@ -4,6 +4,8 @@ HTTP response wrapper for Session mode.
 Provides a rich interface for HTTP responses with HTML parsing capabilities.
 """
 
+from collections import deque
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any, Optional, Union
 import json as json_module
 
@@ -15,23 +17,98 @@ from kuromi_browser.session.element import SessionElement
 if TYPE_CHECKING:
     from curl_cffi.requests import Response as CurlResponse
 
+# Use orjson for faster JSON parsing if available, fallback to standard json
+try:
+    import orjson
+
+    def _json_loads(content: bytes) -> Any:
+        """Parse a JSON body from raw bytes using orjson.
+
+        orjson rejects some input the standard parser accepts, such as
+        NaN/Infinity and integers wider than 64 bits, so those bodies are
+        parsed again with json.loads. Invalid JSON still raises
+        json.JSONDecodeError.
+        """
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return json_module.loads(content)
+
+except ImportError:
+
+    def _json_loads(content: bytes) -> Any:
+        """Parse a JSON body from raw bytes using standard json."""
+        return json_module.loads(content)
+
+
+@lru_cache(maxsize=16)
+def _html_parser(encoding: Optional[str]) -> html.HTMLParser:
+    """Get a shared HTML parser for a response encoding.
+
+    Args:
+        encoding: Encoding name, or None to let libxml2 detect it.
+
+    Returns:
+        HTML parser decoding input with the given encoding.
+    """
+    try:
+        return html.HTMLParser(encoding=encoding)
+    except LookupError:
+        # Encoding unknown to libxml2, fall back to its own detection
+        return html.HTMLParser()
+
 
 class Response:
     """HTTP response wrapper with HTML parsing.
 
     Wraps raw HTTP responses (from curl_cffi) and provides
     convenient methods for accessing response data and parsing HTML.
+
+    Responses created by a SessionPool session can be recycled with
+    release() once they are no longer needed.
     """
 
-    def __init__(self, raw_response: "CurlResponse") -> None:
+    __slots__ = ("_response", "_tree", "_root_wrapper", "_json_data", "_cache", "_pool")
+
+    def __init__(
+        self,
+        raw_response: "CurlResponse",
+        pool: Optional[deque["Response"]] = None,
+    ) -> None:
         """Initialize Response wrapper.
 
         Args:
             raw_response: The raw response from curl_cffi.
+            pool: Optional free-list this wrapper is returned to on release().
+        """
+        self._pool = pool
+        self._reset(raw_response)
+
+    def _reset(self, raw_response: Optional["CurlResponse"]) -> None:
+        """Rebind the wrapper to a new raw response, dropping cached data.
+
+        Args:
+            raw_response: The raw response from curl_cffi, or None to clear.
         """
         self._response = raw_response
         self._tree: Optional[_Element] = None
+        self._root_wrapper: Optional[SessionElement] = None
         self._json_data: Optional[Any] = None
+        self._cache: dict[str, Any] = {}
+
+    def release(self) -> None:
+        """Return this wrapper to its pool for reuse.
+
+        The response must not be used after it has been released.
+        Does nothing if the response does not belong to a pool or has
+        already been released, so it is never pooled twice.
+        """
+        pool = self._pool
+        if pool is None:
+            return
+        self._pool = None
+        self._reset(None)
+        pool.append(self)
 
     @property
     def status_code(self) -> int:
@@ -81,6 +158,9 @@ class Response:
     def json(self, **kwargs: Any) -> Any:
         """Parse the response body as JSON.
 
+        The raw body bytes are parsed directly (with orjson when installed).
+        Passing kwargs falls back to json.loads on the decoded text.
+
         Args:
             **kwargs: Arguments passed to json.loads.
 
@@ -91,7 +171,10 @@ class Response:
             json.JSONDecodeError: If the response is not valid JSON.
         """
         if self._json_data is None:
-            self._json_data = json_module.loads(self.text, **kwargs)
+            if kwargs:
+                self._json_data = json_module.loads(self.text, **kwargs)
+            else:
+                self._json_data = _json_loads(self._response.content)
         return self._json_data
 
     @property
@@ -102,9 +185,23 @@ class Response:
             The root element of the parsed HTML document.
         """
         if self._tree is None:
-            self._tree = html.fromstring(self.text)
+            # Parse raw bytes so libxml2 decodes in C, without building an
+            # intermediate str of the whole page
+            content = self._response.content
+            if content:
+                self._tree = html.fromstring(
+                    content, parser=_html_parser(self._response.encoding)
+                )
+            else:
+                self._tree = html.fromstring(self.text)
         return self._tree
 
+    def _root(self) -> SessionElement:
+        """Get the wrapper for the document root, creating it once."""
+        if self._root_wrapper is None:
+            self._root_wrapper = SessionElement(self.tree)
+        return self._root_wrapper
+
     def ele(self, selector: str) -> Optional[SessionElement]:
         """Find the first element matching the selector.
 
@@ -116,8 +213,7 @@ class Response:
         Returns:
             The first matching element or None.
         """
-        root = SessionElement(self.tree)
-        return root.ele(selector)
+        return self._root().ele(selector)
 
     def eles(self, selector: str) -> list[SessionElement]:
         """Find all elements matching the selector.
@@ -128,8 +224,7 @@ class Response:
         Returns:
             List of matching elements.
         """
-        root = SessionElement(self.tree)
-        return root.eles(selector)
+        return self._root().eles(selector)
 
     def xpath(self, expression: str) -> list[SessionElement]:
         """Execute XPath expression on the document.
@@ -140,8 +235,7 @@ class Response:
         Returns:
             List of matching elements.
         """
-        root = SessionElement(self.tree)
-        return root.xpath(expression)
+        return self._root().xpath(expression)
 
     def css(self, selector: str) -> list[SessionElement]:
         """Execute CSS selector on the document.
@@ -152,48 +246,61 @@ class Response:
         Returns:
             List of matching elements.
         """
-        root = SessionElement(self.tree)
-        return root.css(selector)
+        return self._root().css(selector)
+
+    def _cached_ele(self, key: str, selector: str) -> Optional[SessionElement]:
+        """Find the first element matching the selector, memoized by key.
+
+        The parsed tree never changes for a response, so the result is
+        computed once.
+        """
+        cache = self._cache
+        if key not in cache:
+            cache[key] = self.ele(selector)
+        return cache[key]
+
+    def _cached_eles(self, key: str, selector: str) -> list[SessionElement]:
+        """Find all elements matching the selector, memoized by key.
+
+        Callers get a new list each time, so changing it does not alter
+        the cached result.
+        """
+        cache = self._cache
+        if key not in cache:
+            cache[key] = self.eles(selector)
+        return list(cache[key])
 
     @property
     def title(self) -> Optional[str]:
         """Get the page title."""
-        title_elem = self.ele("title")
+        title_elem = self._cached_ele("title", "title")
         return title_elem.text if title_elem else None
 
     @property
     def body(self) -> Optional[SessionElement]:
         """Get the body element."""
-        return self.ele("body")
+        return self._cached_ele("body", "body")
 
     @property
     def head(self) -> Optional[SessionElement]:
         """Get the head element."""
-        return self.ele("head")
+        return self._cached_ele("head", "head")
 
     def links(self) -> list[str]:
-        """Get all href values from <a> elements.
+        """Get unique href values from <a> elements.
 
         Returns:
-            List of href values.
+            List of href values in document order, without duplicates.
         """
-        return [
-            el.attr("href")
-            for el in self.eles("a[href]")
-            if el.attr("href")
-        ]
+        return list(dict.fromkeys(self._root().links()))
 
     def images(self) -> list[str]:
-        """Get all src values from <img> elements.
+        """Get unique src values from <img> elements.
 
         Returns:
-            List of src values.
+            List of src values in document order, without duplicates.
         """
-        return [
-            el.attr("src")
-            for el in self.eles("img[src]")
-            if el.attr("src")
-        ]
+        return list(dict.fromkeys(self._root().images()))
 
     def forms(self) -> list[SessionElement]:
         """Get all form elements.
@@ -201,7 +308,7 @@ class Response:
         Returns:
             List of form elements.
         """
-        return self.eles("form")
+        return self._cached_eles("forms", "form")
 
     def scripts(self) -> list[SessionElement]:
         """Get all script elements.
@@ -209,7 +316,7 @@ class Response:
         Returns:
             List of script elements.
         """
-        return self.eles("script")
+        return self._cached_eles("scripts", "script")
 
     def meta(self, name: Optional[str] = None) -> Union[list[SessionElement], Optional[str]]:
         """Get meta elements or a specific meta content.
@@ -221,8 +328,8 @@ class Response:
             List of meta elements, or the content string if name is provided.
         """
         if name is None:
-            return self.eles("meta")
-        elem = self.ele(f'meta[name="{name}"]')
+            return self._cached_eles("meta", "meta")
+        elem = self._cached_ele(f"meta:{name}", f'meta[name="{name}"]')
         return elem.attr("content") if elem else None
 
     def __repr__(self) -> str:
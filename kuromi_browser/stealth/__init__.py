@@ -15,6 +15,8 @@ Enhanced with techniques from:
 - camoufox: Advanced stealth techniques and consistency validation
 """
 
+import asyncio
+from dataclasses import dataclass
 from typing import Any, Optional
 
 from kuromi_browser.models import Fingerprint
@@ -27,6 +29,13 @@ from kuromi_browser.stealth.cdp.patches import (
     CHROMIUM_STEALTH_ARGS,
     CHROMIUM_ARGS_TO_REMOVE,
     CHROMIUM_DISABLED_FEATURES,
+    AUDIO_NOISE_PATCH,
+    CANVAS_NOISE_PATCH,
+    CHROME_PATCHES,
+    PLUGINS_PATCH,
+    WEBDRIVER_PATCH,
+    WEBGL_PATCH,
+    _fill,
 )
 from kuromi_browser.stealth.fingerprint import (
     FingerprintGenerator,
@@ -54,60 +63,36 @@ except ImportError:
     TLSConfig = None  # type: ignore
 
 
+@dataclass(frozen=True, slots=True, kw_only=True)
 class StealthConfig:
     """Configuration for stealth features.
 
-    Controls which anti-detection measures are applied.
+    Controls which anti-detection measures are applied. Instances are
+    immutable and hashable, so they can be used as cache keys.
     """
 
-    def __init__(
-        self,
-        *,
-        webdriver: bool = True,
-        chrome_app: bool = True,
-        chrome_csi: bool = True,
-        chrome_load_times: bool = True,
-        chrome_runtime: bool = True,
-        iframe_content_window: bool = True,
-        media_codecs: bool = True,
-        navigator_hardware_concurrency: bool = True,
-        navigator_languages: bool = True,
-        navigator_permissions: bool = True,
-        navigator_platform: bool = True,
-        navigator_plugins: bool = True,
-        navigator_user_agent: bool = True,
-        navigator_vendor: bool = True,
-        navigator_webdriver: bool = True,
-        webgl_vendor: bool = True,
-        window_outerdimensions: bool = True,
-        canvas_fingerprint: bool = True,
-        audio_fingerprint: bool = True,
-        font_fingerprint: bool = True,
-        timezone: bool = True,
-        geolocation: bool = True,
-    ) -> None:
-        self.webdriver = webdriver
-        self.chrome_app = chrome_app
-        self.chrome_csi = chrome_csi
-        self.chrome_load_times = chrome_load_times
-        self.chrome_runtime = chrome_runtime
-        self.iframe_content_window = iframe_content_window
-        self.media_codecs = media_codecs
-        self.navigator_hardware_concurrency = navigator_hardware_concurrency
-        self.navigator_languages = navigator_languages
-        self.navigator_permissions = navigator_permissions
-        self.navigator_platform = navigator_platform
-        self.navigator_plugins = navigator_plugins
-        self.navigator_user_agent = navigator_user_agent
-        self.navigator_vendor = navigator_vendor
-        self.navigator_webdriver = navigator_webdriver
-        self.webgl_vendor = webgl_vendor
-        self.window_outerdimensions = window_outerdimensions
-        self.canvas_fingerprint = canvas_fingerprint
-        self.audio_fingerprint = audio_fingerprint
-        self.font_fingerprint = font_fingerprint
-        self.timezone = timezone
-        self.geolocation = geolocation
+    webdriver: bool = True
+    chrome_app: bool = True
+    chrome_csi: bool = True
+    chrome_load_times: bool = True
+    chrome_runtime: bool = True
+    iframe_content_window: bool = True
+    media_codecs: bool = True
+    navigator_hardware_concurrency: bool = True
+    navigator_languages: bool = True
+    navigator_permissions: bool = True
+    navigator_platform: bool = True
+    navigator_plugins: bool = True
+    navigator_user_agent: bool = True
+    navigator_vendor: bool = True
+    navigator_webdriver: bool = True
+    webgl_vendor: bool = True
+    window_outerdimensions: bool = True
+    canvas_fingerprint: bool = True
+    audio_fingerprint: bool = True
+    font_fingerprint: bool = True
+    timezone: bool = True
+    geolocation: bool = True
 
 
 class StealthPatches:
@@ -128,52 +113,65 @@ class StealthPatches:
         self._fingerprint = fingerprint
         self._config = config or StealthConfig()
         self._cdp_patches = CDPPatches(fingerprint)
+        # Fingerprint-specific patches are rendered once and reused
+        self._rendered = self._render_patches()
+        self._combined: Optional[str] = None
+
+    def _render_patches(self) -> dict[str, str]:
+        """Render the fingerprint-dependent patch templates."""
+        fingerprint = self._fingerprint
+
+        webgl = ""
+        if fingerprint and fingerprint.webgl.vendor:
+            webgl = _fill(
+                WEBGL_PATCH,
+                vendor=f"'{fingerprint.webgl.vendor}'",
+                renderer=f"'{fingerprint.webgl.renderer}'",
+            )
+
+        seed = "Date.now()"
+        if fingerprint and fingerprint.canvas.noise_seed:
+            seed = str(fingerprint.canvas.noise_seed)
+
+        return {
+            "webgl": webgl,
+            "canvas": _fill(CANVAS_NOISE_PATCH, seed=seed),
+            "audio": _fill(AUDIO_NOISE_PATCH, seed=seed),
+        }
 
     def generate_patches(self) -> str:
-        """Generate all stealth patches as JavaScript code."""
-        return self._cdp_patches.get_combined_patch()
+        """Generate all stealth patches as JavaScript code.
+
+        The combined script only depends on the fingerprint, so it is
+        built on first use and reused afterwards.
+        """
+        if self._combined is None:
+            self._combined = self._cdp_patches.get_combined_patch()
+        return self._combined
 
     def patch_webdriver(self) -> str:
         """Generate patch to hide webdriver property."""
-        from kuromi_browser.stealth.cdp.patches import WEBDRIVER_PATCH
         return WEBDRIVER_PATCH
 
     def patch_chrome_runtime(self) -> str:
         """Generate patch for chrome.runtime."""
-        from kuromi_browser.stealth.cdp.patches import CHROME_PATCHES
         return CHROME_PATCHES
 
     def patch_navigator_plugins(self) -> str:
         """Generate patch for navigator.plugins."""
-        from kuromi_browser.stealth.cdp.patches import PLUGINS_PATCH
         return PLUGINS_PATCH
 
     def patch_webgl(self) -> str:
         """Generate patch for WebGL fingerprint."""
-        from kuromi_browser.stealth.cdp.patches import WEBGL_PATCH
-        if self._fingerprint and self._fingerprint.webgl.vendor:
-            return WEBGL_PATCH.replace(
-                "{vendor}", f"'{self._fingerprint.webgl.vendor}'"
-            ).replace(
-                "{renderer}", f"'{self._fingerprint.webgl.renderer}'"
-            )
-        return ""
+        return self._rendered["webgl"]
 
     def patch_canvas(self) -> str:
         """Generate patch to add noise to canvas fingerprint."""
-        from kuromi_browser.stealth.cdp.patches import CANVAS_NOISE_PATCH
-        seed = "Date.now()"
-        if self._fingerprint and self._fingerprint.canvas.noise_seed:
-            seed = str(self._fingerprint.canvas.noise_seed)
-        return CANVAS_NOISE_PATCH.replace("{seed}", seed)
+        return self._rendered["canvas"]
 
     def patch_audio(self) -> str:
         """Generate patch to add noise to audio fingerprint."""
-        from kuromi_browser.stealth.cdp.patches import AUDIO_NOISE_PATCH
-        seed = "Date.now()"
-        if self._fingerprint and self._fingerprint.canvas.noise_seed:
-            seed = str(self._fingerprint.canvas.noise_seed)
-        return AUDIO_NOISE_PATCH.replace("{seed}", seed)
+        return self._rendered["audio"]
 
     def patch_fonts(self) -> str:
         """Generate patch for font detection."""
@@ -210,27 +208,33 @@ async def apply_stealth(
 
     # Set user agent if fingerprint provided
     if fingerprint:
-        await cdp_session.send(
-            "Emulation.setUserAgentOverride",
-            {
-                "userAgent": fingerprint.user_agent,
-                "platform": fingerprint.navigator.platform,
-                "acceptLanguage": ",".join(fingerprint.navigator.languages),
-            },
-        )
+        # The overrides are independent, so send them concurrently
+        overrides = [
+            cdp_session.send(
+                "Emulation.setUserAgentOverride",
+                {
+                    "userAgent": fingerprint.user_agent,
+                    "platform": fingerprint.navigator.platform,
+                    "acceptLanguage": ",".join(fingerprint.navigator.languages),
+                },
+            ),
+            # Set locale
+            cdp_session.send(
+                "Emulation.setLocaleOverride",
+                {"locale": fingerprint.locale},
+            ),
+        ]
 
         # Set timezone if configured
         if config is None or config.timezone:
-            await cdp_session.send(
-                "Emulation.setTimezoneOverride",
-                {"timezoneId": fingerprint.timezone},
+            overrides.append(
+                cdp_session.send(
+                    "Emulation.setTimezoneOverride",
+                    {"timezoneId": fingerprint.timezone},
+                )
             )
 
-        # Set locale
-        await cdp_session.send(
-            "Emulation.setLocaleOverride",
-            {"locale": fingerprint.locale},
-        )
+        await asyncio.gather(*overrides)
 
 
 async def apply_stealth_basic(cdp_session: Any) -> None:
@@ -5,12 +5,15 @@ Simulates realistic typing patterns with variable delays,
 typos, and corrections to appear more human-like.
 """
 
+import asyncio
+import math
 import random
 from dataclasses import dataclass
-from typing import Any, Optional
+from functools import lru_cache
+from typing import Any, Callable, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class KeyTiming:
     """Timing information for a keystroke."""
 
@@ -46,32 +49,115 @@ QWERTY_LAYOUT = {
 }
 
 
+# Characters after which a typist pauses before the next sentence
+_SENTENCE_END = frozenset('.!?')
+
+# Fallback position for keys not on the layout (center of the home row)
+_DEFAULT_POSITION = (2, 5)
+
+# Layout positions for both letter cases, so typed text is looked up as-is
+_KEY_POSITIONS = {
+    **QWERTY_LAYOUT,
+    **{k.upper(): pos for k, pos in QWERTY_LAYOUT.items() if k.isalpha()},
+}
+
+# Distances and neighbours are static, so they are computed once here
+# instead of on every keystroke
+_KEY_DISTANCES = {
+    (k1, k2): math.hypot(r1 - r2, c1 - c2)
+    for k1, (r1, c1) in _KEY_POSITIONS.items()
+    for k2, (r2, c2) in _KEY_POSITIONS.items()
+}
+
+# Delay multiplier for moving between two keys, as applied by generate_timing
+_DELAY_FACTORS = {
+    pair: 1 + distance * 0.05 for pair, distance in _KEY_DISTANCES.items()
+}
+
+_ADJACENT_KEYS = {
+    key: tuple(
+        k for k, (r, c) in QWERTY_LAYOUT.items()
+        if k != key.lower() and abs(r - row) <= 1 and abs(c - col) <= 1
+    )
+    for key, (row, col) in _KEY_POSITIONS.items()
+}
+
+
 def _key_distance(key1: str, key2: str) -> float:
     """Calculate approximate distance between two keys."""
-    k1 = key1.lower()
-    k2 = key2.lower()
+    distance = _KEY_DISTANCES.get((key1, key2))
+    if distance is not None:
+        return distance
 
-    pos1 = QWERTY_LAYOUT.get(k1, (2, 5))
-    pos2 = QWERTY_LAYOUT.get(k2, (2, 5))
+    # At least one key is off the layout
+    pos1 = _KEY_POSITIONS.get(key1, _DEFAULT_POSITION)
+    pos2 = _KEY_POSITIONS.get(key2, _DEFAULT_POSITION)
 
     # Euclidean distance
-    return ((pos1[0] - pos2[0]) ** 2 + (pos1[1] - pos2[1]) ** 2) ** 0.5
+    return math.hypot(pos1[0] - pos2[0], pos1[1] - pos2[1])
+
+
+def _typo_gap(probability: float, rand: Callable[[], float] = random.random) -> int:
+    """Draw how many keystrokes pass before the next typo.
 
+    Sampling the gap from the geometric distribution gives the same typo
+    rate as a per-keystroke coin flip with a single random draw per typo.
 
-def _get_adjacent_keys(key: str) -> list[str]:
+    Args:
+        probability: Chance of a typo on any given keystroke (0 < p <= 1)
+        rand: Source of uniform floats in [0, 1)
+
+    Returns:
+        Number of correct keystrokes before the next typo
+    """
+    if probability >= 1.0:
+        return 0
+    return int(math.log(1.0 - rand()) / math.log(1.0 - probability))
+
+
+def _get_adjacent_keys(key: str) -> tuple[str, ...]:
     """Get keys adjacent to the given key on QWERTY keyboard."""
-    key = key.lower()
-    if key not in QWERTY_LAYOUT:
-        return []
+    return _ADJACENT_KEYS.get(key, ())
 
-    row, col = QWERTY_LAYOUT[key]
-    adjacent = []
 
-    for k, (r, c) in QWERTY_LAYOUT.items():
-        if k != key and abs(r - row) <= 1 and abs(c - col) <= 1:
-            adjacent.append(k)
+@lru_cache(maxsize=256)
+def _char_key_events(char: str) -> tuple[dict[str, str], dict[str, str]]:
+    """Get the keyDown and keyUp payloads for a printable character.
 
-    return adjacent
+    The payloads are shared between calls and must not be modified.
+    """
+    return (
+        {"type": "keyDown", "key": char, "text": char},
+        {"type": "keyUp", "key": char},
+    )
+
+
+# Map common key names to CDP key identifiers and the text they produce
+_CDP_KEY_MAP = {
+    'Enter': ('Enter', '\r'),
+    'Tab': ('Tab', '\t'),
+    'Backspace': ('Backspace', ''),
+    'Delete': ('Delete', ''),
+    'Escape': ('Escape', ''),
+    'ArrowUp': ('ArrowUp', ''),
+    'ArrowDown': ('ArrowDown', ''),
+    'ArrowLeft': ('ArrowLeft', ''),
+    'ArrowRight': ('ArrowRight', ''),
+    'Home': ('Home', ''),
+    'End': ('End', ''),
+    'PageUp': ('PageUp', ''),
+    'PageDown': ('PageDown', ''),
+}
+
+# CDP modifier bit masks
+_MODIFIER_MASKS = {
+    'Control': 2,
+    'Ctrl': 2,
+    'Alt': 1,
+    'Shift': 8,
+    'Meta': 4,
+    'Command': 4,
+}
 
 
 class HumanKeyboard:
@@ -101,6 +187,7 @@ class HumanKeyboard:
         text: str,
         speed: Optional[float] = None,
         include_typos: bool = False,
+        seed: Optional[int] = None,
     ) -> list[KeyTiming]:
         """Generate timing information for typing text.
 
@@ -108,6 +195,32 @@ class HumanKeyboard:
             text: Text to type
             speed: Characters per minute (uses TYPING_SPEED_NORMAL if None)
             include_typos: Whether to occasionally include typos
+            seed: Seed for a reproducible sequence. Seeded sequences are
+                cached, so the returned KeyTiming objects are shared and
+                must not be modified.
+
+        Returns:
+            List of KeyTiming objects
+        """
+        if seed is None:
+            return cls._generate_timing(text, speed, include_typos, random)
+        return list(_seeded_timing(cls, text, speed, include_typos, seed))
+
+    @classmethod
+    def _generate_timing(
+        cls,
+        text: str,
+        speed: Optional[float],
+        include_typos: bool,
+        rng: Any,
+    ) -> list[KeyTiming]:
+        """Generate timing information using the given random source.
+
+        Args:
+            text: Text to type
+            speed: Characters per minute (uses TYPING_SPEED_NORMAL if None)
+            include_typos: Whether to occasionally include typos
+            rng: random.Random instance, or the random module itself
 
         Returns:
             List of KeyTiming objects
@@ -118,53 +231,76 @@ class HumanKeyboard:
         # Calculate base delay from speed
         base_delay = 60.0 / speed
 
+        # Bind loop-invariant lookups to locals
+        uniform = rng.uniform
+        rand = rng.random
+        min_delay = cls.MIN_DELAY
+        max_delay = cls.MAX_DELAY * 3
+        hold_min = cls.HOLD_MIN
+        hold_max = cls.HOLD_MAX
+        word_pause_probability = cls.WORD_PAUSE_PROBABILITY
+        word_pause_min = cls.WORD_PAUSE_MIN
+        word_pause_max = cls.WORD_PAUSE_MAX
+        typo_probability = cls.TYPO_PROBABILITY
+        adjacent_keys = _ADJACENT_KEYS
+        delay_factors = _DELAY_FACTORS
+
         timings = []
+        append = timings.append
         prev_key = None
 
+        # Index of the next keystroke to mistype
+        next_typo = -1
+        if include_typos and typo_probability > 0:
+            next_typo = _typo_gap(typo_probability, rand)
+
         for i, char in enumerate(text):
             # Base delay with some randomness
-            delay = base_delay * random.uniform(0.7, 1.5)
+            delay = base_delay * uniform(0.7, 1.5)
 
-            # Adjust delay based on key distance
-            if prev_key:
-                distance = _key_distance(prev_key, char)
-                delay *= 1 + (distance * 0.05)
+            # Adjust delay based on key distance (a repeated key does not move)
+            if prev_key and prev_key != char:
+                factor = delay_factors.get((prev_key, char))
+                if factor is None:
+                    factor = 1 + (_key_distance(prev_key, char) * 0.05)
+                delay *= factor
 
             # Add extra delay at word boundaries
-            if char == ' ' and random.random() < cls.WORD_PAUSE_PROBABILITY:
-                delay += random.uniform(cls.WORD_PAUSE_MIN, cls.WORD_PAUSE_MAX)
+            if char == ' ' and rand() < word_pause_probability:
+                delay += uniform(word_pause_min, word_pause_max)
 
             # Add extra delay after punctuation
-            if prev_key and prev_key in '.!?':
-                delay += random.uniform(0.2, 0.5)
+            if prev_key in _SENTENCE_END:
+                delay += uniform(0.2, 0.5)
 
             # Clamp delay
-            delay = max(cls.MIN_DELAY, min(delay, cls.MAX_DELAY * 3))
+            delay = max(min_delay, min(delay, max_delay))
 
             # Hold duration
-            hold = random.uniform(cls.HOLD_MIN, cls.HOLD_MAX)
+            hold = uniform(hold_min, hold_max)
 
             # Possibly add a typo
-            if include_typos and random.random() < cls.TYPO_PROBABILITY:
-                adjacent = _get_adjacent_keys(char)
+            if i == next_typo:
+                next_typo += 1 + _typo_gap(typo_probability, rand)
+                adjacent = adjacent_keys.get(char)
                 if adjacent:
-                    typo_key = random.choice(adjacent)
+                    typo_key = rng.choice(adjacent)
                     # Add the typo
-                    timings.append(KeyTiming(
+                    append(KeyTiming(
                         key=typo_key,
                         delay_before=delay,
                         hold_duration=hold,
                     ))
                     # Add backspace to correct it
-                    timings.append(KeyTiming(
+                    append(KeyTiming(
                         key='Backspace',
-                        delay_before=random.uniform(0.1, 0.3),
+                        delay_before=uniform(0.1, 0.3),
                         hold_duration=hold,
                     ))
                     # The correct key comes with a shorter delay
-                    delay = random.uniform(0.05, 0.15)
+                    delay = uniform(0.05, 0.15)
 
-            timings.append(KeyTiming(
+            append(KeyTiming(
                 key=char,
                 delay_before=delay,
                 hold_duration=hold,
@@ -181,6 +317,7 @@ class HumanKeyboard:
         text: str,
         speed: Optional[float] = None,
         include_typos: bool = False,
+        insert_text: bool = False,
     ) -> None:
         """Type text with human-like timing.
 
@@ -189,38 +326,44 @@ class HumanKeyboard:
             text: Text to type
             speed: Characters per minute
             include_typos: Whether to include occasional typos
+            insert_text: Insert the text with a single Input.insertText call
+                instead of key events. Skips timing, typos and keydown/keyup
+                events, so only use it where pages do not watch the keyboard.
         """
-        import asyncio
+        if insert_text:
+            await cdp_session.send("Input.insertText", {"text": text})
+            return
 
         timings = cls.generate_timing(text, speed, include_typos)
 
+        # keyUp of the previous character, still in flight
+        pending_up = None
+
         for timing in timings:
             # Wait before pressing the key
             await asyncio.sleep(timing.delay_before)
 
+            if pending_up is not None:
+                await pending_up
+                pending_up = None
+
             # Send the keystroke
             if len(timing.key) == 1:
                 # Regular character
-                await cdp_session.send(
-                    "Input.dispatchKeyEvent",
-                    {
-                        "type": "keyDown",
-                        "key": timing.key,
-                        "text": timing.key,
-                    },
-                )
+                key_down, key_up = _char_key_events(timing.key)
+                await cdp_session.send("Input.dispatchKeyEvent", key_down)
                 await asyncio.sleep(timing.hold_duration)
-                await cdp_session.send(
-                    "Input.dispatchKeyEvent",
-                    {
-                        "type": "keyUp",
-                        "key": timing.key,
-                    },
+                # The release round trip overlaps the next delay
+                pending_up = asyncio.ensure_future(
+                    cdp_session.send("Input.dispatchKeyEvent", key_up)
                 )
             else:
                 # Special key (Backspace, Enter, etc.)
                 await cls.press_key(cdp_session, timing.key, timing.hold_duration)
 
+        if pending_up is not None:
+            await pending_up
+
     @classmethod
     async def press_key(
         cls,
@@ -235,30 +378,11 @@ class HumanKeyboard:
             key: Key to press (e.g., 'Enter', 'Tab', 'Escape')
             hold_duration: How long to hold the key
         """
-        import asyncio
-
         if hold_duration is None:
             hold_duration = random.uniform(cls.HOLD_MIN, cls.HOLD_MAX)
 
-        # Map common key names to CDP key identifiers
-        key_map = {
-            'Enter': ('Enter', '\r'),
-            'Tab': ('Tab', '\t'),
-            'Backspace': ('Backspace', ''),
-            'Delete': ('Delete', ''),
-            'Escape': ('Escape', ''),
-            'ArrowUp': ('ArrowUp', ''),
-            'ArrowDown': ('ArrowDown', ''),
-            'ArrowLeft': ('ArrowLeft', ''),
-            'ArrowRight': ('ArrowRight', ''),
-            'Home': ('Home', ''),
-            'End': ('End', ''),
-            'PageUp': ('PageUp', ''),
-            'PageDown': ('PageDown', ''),
-        }
-
-        if key in key_map:
-            key_name, text = key_map[key]
+        if key in _CDP_KEY_MAP:
+            key_name, text = _CDP_KEY_MAP[key]
         else:
             key_name = key
             text = key if len(key) == 1 else ''
@@ -294,42 +418,33 @@ class HumanKeyboard:
             cdp_session: CDP session with send() method
             *keys: Keys to press simultaneously
         """
-        import asyncio
-
-        # Modifier mapping
-        modifiers = {
-            'Control': 2,
-            'Ctrl': 2,
-            'Alt': 1,
-            'Shift': 8,
-            'Meta': 4,
-            'Command': 4,
-        }
-
+        # Split the keys once; the press and release loops reuse the result
+        mods = []
         modifier_value = 0
         main_key = None
 
         for key in keys:
-            if key in modifiers:
-                modifier_value |= modifiers[key]
-            else:
+            mask = _MODIFIER_MASKS.get(key)
+            if mask is None:
                 main_key = key
+            else:
+                mods.append(key)
+                modifier_value |= mask
 
         if main_key is None:
             return
 
         # Press modifiers first
-        for key in keys:
-            if key in modifiers:
-                await cdp_session.send(
-                    "Input.dispatchKeyEvent",
-                    {
-                        "type": "keyDown",
-                        "key": key,
-                        "modifiers": modifier_value,
-                    },
-                )
-                await asyncio.sleep(random.uniform(0.02, 0.05))
+        for key in mods:
+            await cdp_session.send(
+                "Input.dispatchKeyEvent",
+                {
+                    "type": "keyDown",
+                    "key": key,
+                    "modifiers": modifier_value,
+                },
+            )
+            await asyncio.sleep(random.uniform(0.02, 0.05))
 
         # Press main key
         await cdp_session.send(
@@ -355,16 +470,15 @@ class HumanKeyboard:
         )
 
         # Release modifiers in reverse order
-        for key in reversed(keys):
-            if key in modifiers:
-                await asyncio.sleep(random.uniform(0.02, 0.05))
-                await cdp_session.send(
-                    "Input.dispatchKeyEvent",
-                    {
-                        "type": "keyUp",
-                        "key": key,
-                    },
-                )
+        for key in reversed(mods):
+            await asyncio.sleep(random.uniform(0.02, 0.05))
+            await cdp_session.send(
+                "Input.dispatchKeyEvent",
+                {
+                    "type": "keyUp",
+                    "key": key,
+                },
+            )
 
     @classmethod
     async def clear_input(
@@ -398,3 +512,17 @@ class HumanKeyboard:
             "Input.insertText",
             {"text": text},
         )
+
+
+@lru_cache(maxsize=256)
+def _seeded_timing(
+    keyboard: type[HumanKeyboard],
+    text: str,
+    speed: Optional[float],
+    include_typos: bool,
+    seed: int,
+) -> tuple[KeyTiming, ...]:
+    """Generate and cache the timing sequence for a fixed seed."""
+    return tuple(keyboard._generate_timing(
+        text, speed, include_typos, random.Random(seed)
+    ))
@@ -5,13 +5,16 @@ Generates realistic mouse paths using Bezier curves and
 adds natural timing variations to simulate human behavior.
 """
 
+import asyncio
 import math
 import random
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
 from typing import Any, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Point:
     """A 2D point."""
 
@@ -24,10 +27,10 @@ class Point:
 
     def distance_to(self, other: "Point") -> float:
         """Calculate Euclidean distance to another point."""
-        return math.sqrt((self.x - other.x) ** 2 + (self.y - other.y) ** 2)
+        return math.hypot(self.x - other.x, self.y - other.y)
 
 
-@dataclass
+@dataclass(slots=True)
 class MousePath:
     """A mouse movement path with timing information."""
 
@@ -43,6 +46,46 @@ class MousePath:
         return sum(self.durations)
 
 
+@lru_cache(maxsize=128)
+def _bernstein_basis(num_points: int) -> tuple[tuple[float, float, float, float], ...]:
+    """Get cubic Bernstein weights for num_points evenly spaced t in [0, 1].
+
+    The weights only depend on the number of samples, and generate_path
+    uses at most 100, so each grid is computed once and shared by every
+    curve of that length.
+
+    Args:
+        num_points: Number of samples along the curve
+
+    Returns:
+        One (b0, b1, b2, b3) tuple per sample
+    """
+    last = num_points - 1 or 1
+    basis = []
+    for i in range(num_points):
+        t = i / last
+        mt = 1 - t
+        basis.append((mt * mt * mt, 3 * mt * mt * t, 3 * mt * t * t, t * t * t))
+    return tuple(basis)
+
+
+@lru_cache(maxsize=128)
+def _ease_speed_factors(segments: int) -> tuple[float, ...]:
+    """Get the speed multiplier for each segment of a path.
+
+    The multiplier follows half a cosine wave, so the cursor starts slowly
+    and keeps accelerating until the last segment.
+
+    Args:
+        segments: Number of segments in the path
+
+    Returns:
+        Multiplier per segment, rising from 0.5 towards 1.5
+    """
+    angle_step = math.pi / segments
+    return tuple(1.0 - 0.5 * math.cos(angle_step * i) for i in range(segments))
+
+
 class HumanMouse:
     """Generate human-like mouse movements.
 
@@ -82,16 +125,17 @@ class HumanMouse:
         Returns:
             Point on the curve
         """
+        # Bernstein weights, computed once and shared by both axes
         mt = 1 - t
-        mt2 = mt * mt
-        mt3 = mt2 * mt
-        t2 = t * t
-        t3 = t2 * t
-
-        x = mt3 * p0.x + 3 * mt2 * t * p1.x + 3 * mt * t2 * p2.x + t3 * p3.x
-        y = mt3 * p0.y + 3 * mt2 * t * p1.y + 3 * mt * t2 * p2.y + t3 * p3.y
-
-        return Point(x, y)
+        b0 = mt * mt * mt
+        b1 = 3 * mt * mt * t
+        b2 = 3 * mt * t * t
+        b3 = t * t * t
+
+        return Point(
+            b0 * p0.x + b1 * p1.x + b2 * p2.x + b3 * p3.x,
+            b0 * p0.y + b1 * p1.y + b2 * p2.y + b3 * p3.y,
+        )
 
     @classmethod
     def bezier_curve(
@@ -112,6 +156,35 @@ class HumanMouse:
         Returns:
             List of (x, y) points forming the path
         """
+        return [
+            (round(x), round(y))
+            for x, y in cls._bezier_curve_float(
+                start, end, num_points, control_deviation
+            )
+        ]
+
+    @classmethod
+    def _bezier_curve_float(
+        cls,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        num_points: int,
+        control_deviation: Optional[tuple[int, int]] = None,
+    ) -> list[tuple[float, float]]:
+        """Generate a cubic Bezier path without rounding the samples.
+
+        generate_path jitters the samples before they are sent, so it
+        works on the unrounded coordinates directly.
+
+        Args:
+            start: Starting position (x, y)
+            end: Ending position (x, y)
+            num_points: Number of points in the path
+            control_deviation: Range for control point deviation
+
+        Returns:
+            List of (x, y) float points forming the path
+        """
         if control_deviation is None:
             control_deviation = (
                 cls.CONTROL_DEVIATION_MIN,
@@ -143,14 +216,19 @@ class HumanMouse:
         cp2_y += random.uniform(-deviation, deviation)
         p2 = Point(cp2_x, cp2_y)
 
-        # Generate points along the curve
-        points = []
-        for i in range(num_points):
-            t = i / (num_points - 1) if num_points > 1 else 0
-            point = cls.bezier_point(t, p0, p1, p2, p3)
-            points.append((int(round(point.x)), int(round(point.y))))
+        # Generate points along the curve from the shared basis weights
+        x0, y0 = p0.x, p0.y
+        x1, y1 = p1.x, p1.y
+        x2, y2 = p2.x, p2.y
+        x3, y3 = p3.x, p3.y
 
-        return points
+        return [
+            (
+                b0 * x0 + b1 * x1 + b2 * x2 + b3 * x3,
+                b0 * y0 + b1 * y1 + b2 * y2 + b3 * y3,
+            )
+            for b0, b1, b2, b3 in _bernstein_basis(num_points)
+        ]
 
     @classmethod
     def generate_path(
@@ -175,9 +253,7 @@ class HumanMouse:
             speed = random.uniform(cls.SPEED_MIN, cls.SPEED_MAX)
 
         # Calculate distance and number of points
-        distance = math.sqrt(
-            (end[0] - start[0]) ** 2 + (end[1] - start[1]) ** 2
-        )
+        distance = math.hypot(end[0] - start[0], end[1] - start[1])
 
         # More points for longer distances
         num_points = max(10, min(100, int(distance / 10)))
@@ -190,47 +266,60 @@ class HumanMouse:
             overshoot_y = int(start[1] + (end[1] - start[1]) * overshoot_factor)
 
             # Path to overshoot point
-            points1 = cls.bezier_curve(start, (overshoot_x, overshoot_y), num_points - 5)
+            points1 = cls._bezier_curve_float(
+                start, (overshoot_x, overshoot_y), num_points - 5
+            )
             # Correction path back to target
-            points2 = cls.bezier_curve(
+            points2 = cls._bezier_curve_float(
                 (overshoot_x, overshoot_y),
                 end,
                 5,
                 control_deviation=(5, 20),
             )
-            raw_points = points1 + points2[1:]  # Avoid duplicate point
+            # Skip the correction's first point, it duplicates the overshoot
+            raw_points = points1
+            raw_points.extend(islice(points2, 1, None))
         else:
-            raw_points = cls.bezier_curve(start, end, num_points)
-
-        # Add jitter
-        points = []
-        for i, (x, y) in enumerate(raw_points):
-            if i == 0 or i == len(raw_points) - 1:
-                # No jitter on start and end points
-                points.append(Point(float(x), float(y)))
-            else:
-                jx = x + random.uniform(-cls.JITTER_MAX, cls.JITTER_MAX)
-                jy = y + random.uniform(-cls.JITTER_MAX, cls.JITTER_MAX)
-                points.append(Point(jx, jy))
+            raw_points = cls._bezier_curve_float(start, end, num_points)
+
+        # Draw uniform values as offset + span * random(), which is what
+        # random.uniform does, without its extra Python call per draw
+        rand = random.random
+        jitter_span = 2 * cls.JITTER_MAX
+        jitter_min = -cls.JITTER_MAX
+
+        # Add jitter to the interior points; start and end stay exact
+        last = len(raw_points) - 1
+        points = [Point(*raw_points[0])]
+        points += [
+            Point(
+                x + jitter_min + jitter_span * rand(),
+                y + jitter_min + jitter_span * rand(),
+            )
+            for x, y in raw_points[1:last]
+        ]
+        if last:
+            points.append(Point(*raw_points[last]))
 
         # Calculate timing with easing
+        hypot = math.hypot
+
         durations = []
-        for i in range(len(points) - 1):
+        append = durations.append
+        for (a, b), factor in zip(
+            zip(points, points[1:]), _ease_speed_factors(len(points) - 1)
+        ):
             # Calculate distance between consecutive points
-            segment_dist = points[i].distance_to(points[i + 1])
+            segment_dist = hypot(a.x - b.x, a.y - b.y)
 
-            # Apply easing: slower at start and end
-            t = i / (len(points) - 1)
-            # Ease in-out function
-            ease = 0.5 - 0.5 * math.cos(math.pi * t)
-            # Speed varies: slower at edges, faster in middle
-            current_speed = speed * (0.5 + ease)
+            # Slow start, speeding up towards the target
+            current_speed = speed * factor
 
             # Calculate duration for this segment
             duration = segment_dist / current_speed if current_speed > 0 else 0.01
             # Add some randomness
-            duration *= random.uniform(0.8, 1.2)
-            durations.append(max(0.001, duration))
+            duration *= 0.8 + 0.4 * rand()
+            append(max(0.001, duration))
 
         return MousePath(points=points, durations=durations)
 
@@ -250,23 +339,30 @@ class HumanMouse:
             end: Ending position (x, y)
             speed: Movement speed (pixels/second)
         """
-        import asyncio
-
         path = cls.generate_path(start, end, speed)
 
+        # Each event's round trip overlaps the delay before the next one;
+        # it is awaited before the next send so events stay in order
+        pending = None
+
         for i, point in enumerate(path.points):
-            await cdp_session.send(
+            if pending is not None:
+                await pending
+            pending = asyncio.ensure_future(cdp_session.send(
                 "Input.dispatchMouseEvent",
                 {
                     "type": "mouseMoved",
                     "x": int(point.x),
                     "y": int(point.y),
                 },
-            )
+            ))
 
             if i < len(path.durations):
                 await asyncio.sleep(path.durations[i])
 
+        if pending is not None:
+            await pending
+
     @classmethod
     async def click(
         cls,
@@ -289,8 +385,6 @@ class HumanMouse:
             move_to: Whether to move mouse to position first
             current_pos: Current mouse position (for movement)
         """
-        import asyncio
-
         if move_to and current_pos:
             await cls.move(cdp_session, current_pos, (x, y))
 
@@ -349,8 +443,6 @@ class HumanMouse:
             delta_y: Vertical scroll amount
             steps: Number of scroll steps
         """
-        import asyncio
-
         step_x = delta_x / steps if steps > 0 else delta_x
         step_y = delta_y / steps if steps > 0 else delta_y
 
@@ -389,8 +481,6 @@ class HumanMouse:
             end: Ending position (x, y)
             button: Mouse button to hold during drag
         """
-        import asyncio
-
         # Move to start position
         await cdp_session.send(
             "Input.dispatchMouseEvent",
@@ -420,8 +510,13 @@ class HumanMouse:
         # Generate and follow path
         path = cls.generate_path(start, end)
 
+        # Moves are pipelined with their delays, as in move()
+        pending = None
+
         for i, point in enumerate(path.points[1:], 1):
-            await cdp_session.send(
+            if pending is not None:
+                await pending
+            pending = asyncio.ensure_future(cdp_session.send(
                 "Input.dispatchMouseEvent",
                 {
                     "type": "mouseMoved",
@@ -429,11 +524,14 @@ class HumanMouse:
                     "y": int(point.y),
                     "button": button,
                 },
-            )
+            ))
 
             if i < len(path.durations):
                 await asyncio.sleep(path.durations[i])
 
+        if pending is not None:
+            await pending
+
         await asyncio.sleep(random.uniform(0.05, 0.1))
 
         # Release mouse button
@@ -5,6 +5,8 @@ These patches are injected before any page scripts run to modify
 JavaScript APIs and hide automation artifacts.
 """
 
+import json
+import re
 from typing import Any, Optional
 
 from kuromi_browser.models import Fingerprint
@@ -77,17 +79,18 @@ CHROME_PATCHES = """
 
     // Chrome loadTimes (deprecated but still checked)
     window.chrome.loadTimes = function() {
+        const now = Date.now() / 1000;
         return {
-            commitLoadTime: Date.now() / 1000,
+            commitLoadTime: now,
             connectionInfo: 'h2',
-            finishDocumentLoadTime: Date.now() / 1000,
-            finishLoadTime: Date.now() / 1000,
+            finishDocumentLoadTime: now,
+            finishLoadTime: now,
             firstPaintAfterLoadTime: 0,
-            firstPaintTime: Date.now() / 1000,
+            firstPaintTime: now,
             navigationType: 'Other',
             npnNegotiatedProtocol: 'h2',
-            requestTime: Date.now() / 1000 - 0.1,
-            startLoadTime: Date.now() / 1000 - 0.1,
+            requestTime: now - 0.1,
+            startLoadTime: now - 0.1,
             wasAlternateProtocolAvailable: false,
             wasFetchedViaSpdy: true,
             wasNpnNegotiated: true
@@ -96,10 +99,12 @@ CHROME_PATCHES = """
 
     // Chrome csi (deprecated but still checked)
     window.chrome.csi = function() {
+        const now = Date.now();
+        const navigationStart = performance.timing.navigationStart;
         return {
-            onloadT: Date.now(),
-            pageT: Date.now() - performance.timing.navigationStart,
-            startE: performance.timing.navigationStart,
+            onloadT: now,
+            pageT: now - navigationStart,
+            startE: navigationStart,
             tran: 15
         };
     };
@@ -174,98 +179,86 @@ CONSOLE_PATCH = """
 })();
 """
 
-# Plugin and mimeType patches
+# Plugins reported by a stock desktop Chrome, all backed by the PDF viewer
+_PLUGIN_DATA = [
+    {
+        "name": name,
+        "description": "Portable Document Format",
+        "filename": "internal-pdf-viewer",
+        "mimeTypes": [{"type": "application/pdf", "suffixes": "pdf"}],
+    }
+    for name in (
+        "Chrome PDF Viewer",
+        "Chromium PDF Viewer",
+        "Microsoft Edge PDF Viewer",
+        "PDF Viewer",
+        "WebKit built-in PDF",
+    )
+]
+
+# Plugin and mimeType patches. The plugin data is shipped as a JSON string
+# literal, which V8 parses faster than the equivalent object literal.
 PLUGINS_PATCH = """
 (() => {
-    const pluginData = [
-        {
-            name: 'Chrome PDF Viewer',
-            description: 'Portable Document Format',
-            filename: 'internal-pdf-viewer',
-            mimeTypes: [{type: 'application/pdf', suffixes: 'pdf'}]
-        },
-        {
-            name: 'Chromium PDF Viewer',
-            description: 'Portable Document Format',
-            filename: 'internal-pdf-viewer',
-            mimeTypes: [{type: 'application/pdf', suffixes: 'pdf'}]
-        },
-        {
-            name: 'Microsoft Edge PDF Viewer',
-            description: 'Portable Document Format',
-            filename: 'internal-pdf-viewer',
-            mimeTypes: [{type: 'application/pdf', suffixes: 'pdf'}]
-        },
-        {
-            name: 'PDF Viewer',
-            description: 'Portable Document Format',
-            filename: 'internal-pdf-viewer',
-            mimeTypes: [{type: 'application/pdf', suffixes: 'pdf'}]
-        },
-        {
-            name: 'WebKit built-in PDF',
-            description: 'Portable Document Format',
-            filename: 'internal-pdf-viewer',
-            mimeTypes: [{type: 'application/pdf', suffixes: 'pdf'}]
-        }
-    ];
+    const pluginData = JSON.parse({plugin_data});
+
+    // Descriptors for an array-like: length, indices and named items,
+    // installed with a single Object.defineProperties() call
+    const indexed = (items, key, descs = {}) => {
+        descs.length = { value: items.length, enumerable: true };
+        items.forEach((item, i) => {
+            descs[i] = { value: item, enumerable: true };
+            if (!(item[key] in descs)) {
+                descs[item[key]] = { value: item, enumerable: false };
+            }
+        });
+        return descs;
+    };
 
-    const makeMimeType = (data) => {
+    const makeMimeType = (data, plugin) => {
         const mt = Object.create(MimeType.prototype);
         Object.defineProperties(mt, {
             type: { value: data.type, enumerable: true },
             suffixes: { value: data.suffixes, enumerable: true },
             description: { value: '', enumerable: true },
-            enabledPlugin: { value: null, enumerable: true }
+            enabledPlugin: { value: plugin, enumerable: true }
         });
         return mt;
     };
 
+    // Every plugin's mimeTypes, collected while the plugins are built
+    const mimeTypes = [];
+
     const makePlugin = (data) => {
         const plugin = Object.create(Plugin.prototype);
-        const mimeTypes = data.mimeTypes.map(makeMimeType);
+        const ownMimeTypes = data.mimeTypes.map(mt => makeMimeType(mt, plugin));
+        mimeTypes.push(...ownMimeTypes);
 
-        Object.defineProperties(plugin, {
+        Object.defineProperties(plugin, indexed(ownMimeTypes, 'type', {
             name: { value: data.name, enumerable: true },
             description: { value: data.description, enumerable: true },
-            filename: { value: data.filename, enumerable: true },
-            length: { value: mimeTypes.length, enumerable: true }
-        });
+            filename: { value: data.filename, enumerable: true }
+        }));
 
-        mimeTypes.forEach((mt, i) => {
-            Object.defineProperty(plugin, i, { value: mt, enumerable: true });
-            Object.defineProperty(plugin, mt.type, { value: mt, enumerable: false });
-            Object.defineProperty(mt, 'enabledPlugin', { value: plugin });
-        });
-
-        plugin[Symbol.iterator] = function*() {
-            yield* mimeTypes;
+        plugin[Symbol.iterator] = function() {
+            return ownMimeTypes.values();
         };
 
         return plugin;
     };
 
     const plugins = pluginData.map(makePlugin);
-    const mimeTypes = plugins.flatMap(p => Array.from(p));
 
     const pluginArray = Object.create(PluginArray.prototype);
-    Object.defineProperty(pluginArray, 'length', { value: plugins.length, enumerable: true });
-    plugins.forEach((p, i) => {
-        Object.defineProperty(pluginArray, i, { value: p, enumerable: true });
-        Object.defineProperty(pluginArray, p.name, { value: p, enumerable: false });
-    });
-    pluginArray[Symbol.iterator] = function*() { yield* plugins; };
+    Object.defineProperties(pluginArray, indexed(plugins, 'name'));
+    pluginArray[Symbol.iterator] = function() { return plugins.values(); };
     pluginArray.item = function(i) { return plugins[i] || null; };
     pluginArray.namedItem = function(name) { return plugins.find(p => p.name === name) || null; };
     pluginArray.refresh = function() {};
 
     const mimeTypeArray = Object.create(MimeTypeArray.prototype);
-    Object.defineProperty(mimeTypeArray, 'length', { value: mimeTypes.length, enumerable: true });
-    mimeTypes.forEach((mt, i) => {
-        Object.defineProperty(mimeTypeArray, i, { value: mt, enumerable: true });
-        Object.defineProperty(mimeTypeArray, mt.type, { value: mt, enumerable: false });
-    });
-    mimeTypeArray[Symbol.iterator] = function*() { yield* mimeTypes; };
+    Object.defineProperties(mimeTypeArray, indexed(mimeTypes, 'type'));
+    mimeTypeArray[Symbol.iterator] = function() { return mimeTypes.values(); };
     mimeTypeArray.item = function(i) { return mimeTypes[i] || null; };
     mimeTypeArray.namedItem = function(name) { return mimeTypes.find(m => m.type === name) || null; };
 
@@ -284,13 +277,18 @@ PLUGINS_PATCH = """
         configurable: true
     });
 })();
-"""
+""".replace(
+    "{plugin_data}",
+    json.dumps(json.dumps(_PLUGIN_DATA, separators=(",", ":"))),
+)
 
 # Language consistency patches
 LANGUAGES_PATCH = """
 ((languages) => {
+    // Chrome hands out the same frozen array on every read
+    const frozen = Object.freeze([...languages]);
     Object.defineProperty(navigator, 'languages', {
-        get: () => Object.freeze([...languages]),
+        get: () => frozen,
         configurable: true
     });
 
@@ -298,7 +296,7 @@ LANGUAGES_PATCH = """
         get: () => languages[0],
         configurable: true
     });
-})(['en-US', 'en']);
+})({languages});
 """
 
 # Hardware concurrency patch
@@ -324,102 +322,151 @@ DEVICE_MEMORY_PATCH = """
 # WebGL vendor/renderer patch
 WEBGL_PATCH = """
 ((vendor, renderer) => {
-    const getParameterProxyHandler = {
-        apply: function(target, thisArg, args) {
-            const param = args[0];
-            const gl = thisArg;
-
-            // UNMASKED_VENDOR_WEBGL
-            if (param === 37445) {
-                return vendor;
-            }
-            // UNMASKED_RENDERER_WEBGL
-            if (param === 37446) {
-                return renderer;
-            }
-
-            return Reflect.apply(target, thisArg, args);
-        }
-    };
-
-    const contexts = ['webgl', 'experimental-webgl', 'webgl2', 'experimental-webgl2'];
-    const originalGetContext = HTMLCanvasElement.prototype.getContext;
-
-    HTMLCanvasElement.prototype.getContext = function(type, ...args) {
-        const context = originalGetContext.apply(this, [type, ...args]);
-
-        if (context && contexts.includes(type)) {
-            const ext = context.getExtension('WEBGL_debug_renderer_info');
-            if (ext) {
-                context.getParameter = new Proxy(context.getParameter, getParameterProxyHandler);
+    // UNMASKED_VENDOR_WEBGL and UNMASKED_RENDERER_WEBGL
+    const UNMASKED_VENDOR = 37445;
+    const UNMASKED_RENDERER = 37446;
+
+    // Replace getParameter once on the prototypes with a plain method
+    // rather than wrapping every context in a Proxy. Method shorthand
+    // gives it the native name and no prototype property.
+    [window.WebGLRenderingContext, window.WebGL2RenderingContext].forEach((ctor) => {
+        if (!ctor) return;
+        const original = ctor.prototype.getParameter;
+        const { getParameter } = {
+            getParameter(param) {
+                if (param === UNMASKED_VENDOR) return vendor;
+                if (param === UNMASKED_RENDERER) return renderer;
+                return original.call(this, param);
             }
+        };
+        if (window.__fp_markAsProxied) {
+            window.__fp_markAsProxied(getParameter, original);
         }
-
-        return context;
-    };
+        ctor.prototype.getParameter = getParameter;
+    });
 })({vendor}, {renderer});
 """
 
+# Seeded xorshift32 generator shared by the stateful noise patches. It
+# yields floats in [0, 1) using only integer ops, and is far cheaper than
+# the Math.sin() hash when called once per pixel or audio sample.
+_XORSHIFT32_RANDOM = """
+    const random = ((s) => {
+        s = (s | 0) || 1;
+        return () => {
+            s ^= s << 13;
+            s ^= s >>> 17;
+            s ^= s << 5;
+            return (s >>> 0) / 4294967296;
+        };
+    })(seed || Date.now());
+"""
+
 # Canvas fingerprint noise
 CANVAS_NOISE_PATCH = """
 ((seed) => {
-    const random = (function() {
-        let s = seed || Date.now();
-        return function() {
-            s = Math.sin(s) * 10000;
-            return s - Math.floor(s);
+{xorshift32_random}
+
+    const canvasProto = HTMLCanvasElement.prototype;
+    const contextProto = CanvasRenderingContext2D.prototype;
+    const originalGetImageData = contextProto.getImageData;
+    const originalPutImageData = contextProto.putImageData;
+
+    // Canvases whose current pixels already carry noise. Drawing or
+    // resizing makes them dirty again, so a canvas that is read
+    // repeatedly is only noised once.
+    const noised = new WeakSet();
+
+    // Replace proto[name] with a method that looks native: method shorthand
+    // gives it the right name and no prototype property, length is copied
+    // and toString() reports the original source
+    const replaceMethod = (proto, name, impl) => {
+        const original = proto[name];
+        if (typeof original !== 'function') return;
+        const { [name]: method } = {
+            [name](...args) {
+                return impl.call(this, original, args);
+            }
         };
-    })();
-
-    const originalToDataURL = HTMLCanvasElement.prototype.toDataURL;
-    const originalToBlob = HTMLCanvasElement.prototype.toBlob;
-    const originalGetImageData = CanvasRenderingContext2D.prototype.getImageData;
+        Object.defineProperty(method, 'length', { value: original.length });
+        if (window.__fp_markAsProxied) {
+            window.__fp_markAsProxied(method, original);
+        }
+        proto[name] = method;
+    };
 
     const addNoise = (canvas) => {
+        if (noised.has(canvas)) return;
+
         const ctx = canvas.getContext('2d');
         if (!ctx) return;
 
         const imageData = originalGetImageData.call(ctx, 0, 0, canvas.width, canvas.height);
         const data = imageData.data;
 
-        for (let i = 0; i < data.length; i += 4) {
-            // Add tiny noise to RGB channels
-            const noise = Math.floor(random() * 3) - 1;
-            data[i] = Math.max(0, Math.min(255, data[i] + noise));
-            data[i + 1] = Math.max(0, Math.min(255, data[i + 1] + noise));
-            data[i + 2] = Math.max(0, Math.min(255, data[i + 2] + noise));
+        // Add tiny noise to RGB channels. ImageData is a Uint8ClampedArray,
+        // so stores saturate at 0 and 255 without explicit clamping.
+        for (let i = 0, n = data.length; i < n; i += 4) {
+            const noise = ((random() * 3) | 0) - 1;
+            data[i] += noise;
+            data[i + 1] += noise;
+            data[i + 2] += noise;
         }
 
-        ctx.putImageData(imageData, 0, 0);
+        originalPutImageData.call(ctx, imageData, 0, 0);
+        noised.add(canvas);
     };
 
-    HTMLCanvasElement.prototype.toDataURL = function(...args) {
+    [
+        'clearRect', 'fillRect', 'strokeRect', 'fillText', 'strokeText',
+        'drawImage', 'putImageData', 'fill', 'stroke', 'reset'
+    ].forEach((name) => {
+        replaceMethod(contextProto, name, function(original, args) {
+            noised.delete(this.canvas);
+            return original.apply(this, args);
+        });
+    });
+
+    // Assigning width or height clears the bitmap, even when the value is
+    // unchanged. The setter is rebuilt from an accessor literal so that it
+    // keeps the native "set width" name and length.
+    ['width', 'height'].forEach((prop) => {
+        const descriptor = Object.getOwnPropertyDescriptor(canvasProto, prop);
+        if (!descriptor || !descriptor.set) return;
+        const originalSet = descriptor.set;
+        const { set } = Object.getOwnPropertyDescriptor({
+            set [prop](value) {
+                noised.delete(this);
+                originalSet.call(this, value);
+            }
+        }, prop);
+        if (window.__fp_markAsProxied) {
+            window.__fp_markAsProxied(set, originalSet);
+        }
+        Object.defineProperty(canvasProto, prop, { ...descriptor, set });
+    });
+
+    replaceMethod(canvasProto, 'toDataURL', function(original, args) {
         addNoise(this);
-        return originalToDataURL.apply(this, args);
-    };
+        return original.apply(this, args);
+    });
 
-    HTMLCanvasElement.prototype.toBlob = function(callback, ...args) {
+    replaceMethod(canvasProto, 'toBlob', function(original, args) {
         addNoise(this);
-        return originalToBlob.call(this, callback, ...args);
-    };
+        return original.apply(this, args);
+    });
 
-    CanvasRenderingContext2D.prototype.getImageData = function(...args) {
+    replaceMethod(contextProto, 'getImageData', function(original, args) {
         addNoise(this.canvas);
-        return originalGetImageData.apply(this, args);
-    };
+        return original.apply(this, args);
+    });
 })({seed});
-"""
+""".replace("{xorshift32_random}", _XORSHIFT32_RANDOM)
 
 # AudioContext fingerprint noise
 AUDIO_NOISE_PATCH = """
 ((seed) => {
-    const random = (function() {
-        let s = seed || Date.now();
-        return function() {
-            s = Math.sin(s) * 10000;
-            return s - Math.floor(s);
-        };
-    })();
+{xorshift32_random}
 
     const originalGetFloatFrequencyData = AnalyserNode.prototype.getFloatFrequencyData;
     const originalGetByteFrequencyData = AnalyserNode.prototype.getByteFrequencyData;
@@ -427,27 +474,30 @@ AUDIO_NOISE_PATCH = """
 
     AnalyserNode.prototype.getFloatFrequencyData = function(array) {
         originalGetFloatFrequencyData.call(this, array);
-        for (let i = 0; i < array.length; i++) {
-            array[i] = array[i] + random() * 0.0001;
+        for (let i = 0, n = array.length; i < n; i++) {
+            array[i] += random() * 0.0001;
         }
     };
 
     AnalyserNode.prototype.getByteFrequencyData = function(array) {
         originalGetByteFrequencyData.call(this, array);
-        for (let i = 0; i < array.length; i++) {
-            array[i] = Math.min(255, Math.max(0, array[i] + Math.floor(random() * 2)));
+        // The noise is 0 or 1, so only the upper bound can overflow the
+        // (wrapping, not clamped) Uint8Array
+        for (let i = 0, n = array.length; i < n; i++) {
+            const v = array[i] + ((random() * 2) | 0);
+            array[i] = v > 255 ? 255 : v;
         }
     };
 
     AudioBuffer.prototype.getChannelData = function(channel) {
         const array = originalGetChannelData.call(this, channel);
-        for (let i = 0; i < array.length; i++) {
-            array[i] = array[i] + (random() - 0.5) * 0.0001;
+        for (let i = 0, n = array.length; i < n; i++) {
+            array[i] += (random() - 0.5) * 0.0001;
         }
         return array;
     };
 })({seed});
-"""
+""".replace("{xorshift32_random}", _XORSHIFT32_RANDOM)
 
 # Screen dimensions patch
 SCREEN_PATCH = """
@@ -471,8 +521,10 @@ TIMEZONE_PATCH = """
 ((timezone, offset) => {
     const DateTimeFormat = Intl.DateTimeFormat;
     Intl.DateTimeFormat = function(locales, options) {
-        options = options || {};
-        options.timeZone = options.timeZone || timezone;
+        // Fill in the zone on a copy; the caller's options must not change
+        if (!options || !options.timeZone) {
+            options = Object.assign({}, options, { timeZone: timezone });
+        }
         return new DateTimeFormat(locales, options);
     };
     Intl.DateTimeFormat.prototype = DateTimeFormat.prototype;
@@ -1113,12 +1165,51 @@ COALESCED_EVENTS_PATCH = """
     // Also ensure getPredictedEvents returns something reasonable
     if (!PointerEvent.prototype.getPredictedEvents) {
         PointerEvent.prototype.getPredictedEvents = function() {
-            return [];  // Predicted events are optional
+            // Predicted events are optional
+            return [];
         };
     }
 })();
 """
 
+
+def _minify(script: str) -> str:
+    """Strip indentation, blank lines and comment lines from a patch script.
+
+    Line breaks are kept, so automatic semicolon insertion behaves exactly
+    as in the readable source. Only whole-line ``//`` comments are dropped;
+    a ``//`` after code may be part of a string, URL or regex.
+    """
+    return "\n".join(
+        stripped for stripped in (line.strip() for line in script.splitlines())
+        if stripped and not stripped.startswith("//")
+    )
+
+
+# Patches are injected into every new document, so they are shipped
+# without the indentation that is only there for readability
+for _name, _script in list(globals().items()):
+    if _name.endswith(("_PATCH", "_PATCHES")) and isinstance(_script, str):
+        globals()[_name] = _minify(_script)
+del _name, _script
+
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
+
+def _fill(template: str, **values: Any) -> str:
+    """Substitute ``{name}`` placeholders in a patch template.
+
+    All placeholders are replaced in a single pass over the template.
+    Braces that do not name one of ``values`` are JavaScript and are
+    left untouched.
+    """
+    def substitute(match: "re.Match[str]") -> str:
+        name = match.group(1)
+        return str(values[name]) if name in values else match.group(0)
+
+    return _PLACEHOLDER_RE.sub(substitute, template)
+
+
 # Chromium Stealth Args Configuration (from Patchright)
 # These are the recommended Chrome flags to avoid detection
 CHROMIUM_STEALTH_ARGS = [
@@ -1220,6 +1311,35 @@ def filter_automation_args(args: list[str]) -> list[str]:
     return filtered
 
 
+# Patches that don't depend on the fingerprint, built once at import
+_BASE_PATCHES: tuple[str, ...] = (
+    TOSTRING_PROTECTION_PATCH,  # Must be first to protect other patches
+    WEBDRIVER_PATCH,
+    CHROME_PATCHES,
+    PERMISSIONS_PATCH,
+    IFRAME_PATCH,
+    CONSOLE_PATCH,
+    PLUGINS_PATCH,
+)
+_BASE_COMBINED = "\n".join(_BASE_PATCHES)
+
+# Patches added in place of the fingerprint-specific ones when there is no
+# fingerprint; their values are fixed, so they are also rendered once
+_DEFAULT_PATCHES: tuple[str, ...] = (
+    _fill(LANGUAGES_PATCH, languages='["en-US", "en"]'),
+    _fill(HARDWARE_CONCURRENCY_PATCH, concurrency=8),
+    _fill(DEVICE_MEMORY_PATCH, memory=8),
+    WEBRTC_DISABLE_PATCH,  # Block WebRTC by default
+    _fill(
+        INPUT_LEAK_FIX_PATCH,
+        chrome_offset_x=0,
+        chrome_offset_y=85,
+        jitter=2,
+    ),
+    COALESCED_EVENTS_PATCH,
+)
+
+
 class CDPPatches:
     """CDP patches for hiding browser automation indicators.
 
@@ -1231,98 +1351,85 @@ class CDPPatches:
     def __init__(self, fingerprint: Optional[Fingerprint] = None) -> None:
         """Initialize CDP patches with optional fingerprint."""
         self._fingerprint = fingerprint
+        self._combined: Optional[str] = None
 
     @staticmethod
-    def get_base_patches() -> list[str]:
+    def get_base_patches() -> tuple[str, ...]:
         """Get all basic stealth patches that don't require customization."""
-        return [
-            TOSTRING_PROTECTION_PATCH,  # Must be first to protect other patches
-            WEBDRIVER_PATCH,
-            CHROME_PATCHES,
-            PERMISSIONS_PATCH,
-            IFRAME_PATCH,
-            CONSOLE_PATCH,
-            PLUGINS_PATCH,
-        ]
+        return _BASE_PATCHES
 
     def get_all_patches(self) -> list[str]:
         """Get all stealth patches including fingerprint-specific ones."""
-        patches = self.get_base_patches()
+        patches = list(_BASE_PATCHES)
 
         if self._fingerprint:
             fp = self._fingerprint
 
-            # Global seed for consistent noise
+            # Global seed for consistent noise, languages and hardware
+            # concurrency
             global_seed = fp.global_seed or fp.canvas.noise_seed or "Date.now()"
-            patches.append(
-                SEEDED_RANDOM_PATCH.replace("{global_seed}", str(global_seed))
-            )
-
-            # Languages
-            langs_js = str(fp.navigator.languages).replace("'", '"')
-            patches.append(
-                LANGUAGES_PATCH.replace("['en-US', 'en']", langs_js)
-            )
-
-            # Hardware concurrency
-            patches.append(
-                HARDWARE_CONCURRENCY_PATCH.replace(
-                    "{concurrency}",
-                    str(fp.navigator.hardware_concurrency)
-                )
-            )
+            patches.extend((
+                _fill(SEEDED_RANDOM_PATCH, global_seed=global_seed),
+                _fill(
+                    LANGUAGES_PATCH,
+                    languages=json.dumps(list(fp.navigator.languages)),
+                ),
+                _fill(
+                    HARDWARE_CONCURRENCY_PATCH,
+                    concurrency=fp.navigator.hardware_concurrency,
+                ),
+            ))
 
             # Device memory
             if fp.navigator.device_memory:
                 patches.append(
-                    DEVICE_MEMORY_PATCH.replace(
-                        "{memory}",
-                        str(fp.navigator.device_memory)
-                    )
+                    _fill(DEVICE_MEMORY_PATCH, memory=fp.navigator.device_memory)
                 )
 
             # WebGL
             if fp.webgl.vendor and fp.webgl.renderer:
                 patches.append(
-                    WEBGL_PATCH
-                    .replace("{vendor}", f"'{fp.webgl.vendor}'")
-                    .replace("{renderer}", f"'{fp.webgl.renderer}'")
+                    _fill(
+                        WEBGL_PATCH,
+                        vendor=f"'{fp.webgl.vendor}'",
+                        renderer=f"'{fp.webgl.renderer}'",
+                    )
                 )
 
             # Canvas noise
             if fp.canvas.noise_enabled:
                 seed = fp.canvas.noise_seed or "Date.now()"
                 patches.append(
-                    CANVAS_NOISE_PATCH.replace("{seed}", str(seed))
+                    _fill(CANVAS_NOISE_PATCH, seed=seed)
                 )
 
             # Audio noise (basic and advanced)
             audio_seed = fp.audio.noise_seed or fp.canvas.noise_seed or "Date.now()"
             patches.append(
-                AUDIO_NOISE_PATCH.replace("{seed}", str(audio_seed))
+                _fill(AUDIO_NOISE_PATCH, seed=audio_seed)
             )
             if fp.audio.noise_enabled:
                 patches.append(
-                    AUDIO_ADVANCED_PATCH.replace("{seed}", str(audio_seed))
+                    _fill(AUDIO_ADVANCED_PATCH, seed=audio_seed)
                 )
 
-            # Screen
-            patches.append(
-                SCREEN_PATCH
-                .replace("{width}", str(fp.screen.width))
-                .replace("{height}", str(fp.screen.height))
-                .replace("{availWidth}", str(fp.screen.avail_width))
-                .replace("{availHeight}", str(fp.screen.avail_height))
-                .replace("{colorDepth}", str(fp.screen.color_depth))
-                .replace("{pixelRatio}", str(fp.screen.device_pixel_ratio))
-            )
-
-            # Timezone
-            patches.append(
-                TIMEZONE_PATCH
-                .replace("{timezone}", f"'{fp.timezone}'")
-                .replace("{offset}", str(fp.timezone_offset))
-            )
+            # Screen and timezone
+            patches.extend((
+                _fill(
+                    SCREEN_PATCH,
+                    width=fp.screen.width,
+                    height=fp.screen.height,
+                    availWidth=fp.screen.avail_width,
+                    availHeight=fp.screen.avail_height,
+                    colorDepth=fp.screen.color_depth,
+                    pixelRatio=fp.screen.device_pixel_ratio,
+                ),
+                _fill(
+                    TIMEZONE_PATCH,
+                    timezone=f"'{fp.timezone}'",
+                    offset=fp.timezone_offset,
+                ),
+            ))
 
             # ========== NEW PATCHES FROM MY-FINGERPRINT ==========
 
@@ -1331,30 +1438,32 @@ class CDPPatches:
                 patches.append(WEBRTC_DISABLE_PATCH)
             elif fp.webrtc.mode == "fake" and fp.webrtc.public_ip:
                 patches.append(
-                    WEBRTC_FAKE_PATCH
-                    .replace("{public_ip}", f"'{fp.webrtc.public_ip}'")
-                    .replace("{local_ip}", f"'{fp.webrtc.local_ip or fp.webrtc.public_ip}'")
+                    _fill(
+                        WEBRTC_FAKE_PATCH,
+                        public_ip=f"'{fp.webrtc.public_ip}'",
+                        local_ip=f"'{fp.webrtc.local_ip or fp.webrtc.public_ip}'",
+                    )
                 )
 
             # WebGPU noise
             if fp.webgpu.noise_enabled:
                 webgpu_seed = fp.webgpu.noise_seed or fp.canvas.noise_seed or "Date.now()"
                 patches.append(
-                    WEBGPU_NOISE_PATCH.replace("{seed}", str(webgpu_seed))
+                    _fill(WEBGPU_NOISE_PATCH, seed=webgpu_seed)
                 )
 
             # DomRect noise
             if fp.dom_rect.noise_enabled:
                 domrect_seed = fp.dom_rect.noise_seed or fp.canvas.noise_seed or "Date.now()"
                 patches.append(
-                    DOMRECT_NOISE_PATCH.replace("{seed}", str(domrect_seed))
+                    _fill(DOMRECT_NOISE_PATCH, seed=domrect_seed)
                 )
 
             # Font noise
             if fp.font_fp.noise_enabled:
                 font_seed = fp.font_fp.noise_seed or fp.canvas.noise_seed or "Date.now()"
                 patches.append(
-                    FONT_NOISE_PATCH.replace("{seed}", str(font_seed))
+                    _fill(FONT_NOISE_PATCH, seed=font_seed)
                 )
 
             # UserAgentData (Client Hints)
@@ -1370,10 +1479,6 @@ class CDPPatches:
                 "fullVersionList": fp.user_agent_data.full_version_list,
                 "wow64": fp.user_agent_data.wow64,
             }
-            import json
-            patches.append(
-                USERAGENTDATA_PATCH.replace("{ua_data}", json.dumps(ua_data))
-            )
 
             # Battery API
             battery_data = {
@@ -1382,9 +1487,6 @@ class CDPPatches:
                 "dischargingTime": fp.battery.discharging_time,
                 "level": fp.battery.level,
             }
-            patches.append(
-                BATTERY_PATCH.replace("{battery_data}", json.dumps(battery_data))
-            )
 
             # Multimedia devices
             devices = {
@@ -1392,65 +1494,63 @@ class CDPPatches:
                 "microphones": fp.multimedia_devices.microphones,
                 "speakers": fp.multimedia_devices.speakers,
             }
-            patches.append(
-                MULTIMEDIA_DEVICES_PATCH.replace("{devices}", json.dumps(devices))
-            )
 
-            # Video/Audio codecs
-            patches.append(
-                CODECS_PATCH
-                .replace("{video_codecs}", json.dumps(fp.video_codecs))
-                .replace("{audio_codecs}", json.dumps(fp.audio_codecs))
-            )
+            # Client hints, battery, devices and video/audio codecs
+            patches.extend((
+                _fill(USERAGENTDATA_PATCH, ua_data=json.dumps(ua_data)),
+                _fill(BATTERY_PATCH, battery_data=json.dumps(battery_data)),
+                _fill(MULTIMEDIA_DEVICES_PATCH, devices=json.dumps(devices)),
+                _fill(
+                    CODECS_PATCH,
+                    video_codecs=json.dumps(fp.video_codecs),
+                    audio_codecs=json.dumps(fp.audio_codecs),
+                ),
+            ))
 
             # ========== PATCHRIGHT TECHNIQUES ==========
 
             # Input Leak Fix (from Patchright/CDP-Patches)
             if hasattr(fp, 'input_leak') and fp.input_leak.enabled:
                 patches.append(
-                    INPUT_LEAK_FIX_PATCH
-                    .replace("{chrome_offset_x}", str(fp.input_leak.chrome_offset_x))
-                    .replace("{chrome_offset_y}", str(fp.input_leak.chrome_offset_y))
-                    .replace("{jitter}", str(fp.input_leak.offset_jitter))
+                    _fill(
+                        INPUT_LEAK_FIX_PATCH,
+                        chrome_offset_x=fp.input_leak.chrome_offset_x,
+                        chrome_offset_y=fp.input_leak.chrome_offset_y,
+                        jitter=fp.input_leak.offset_jitter,
+                    )
                 )
 
             # CoalescedEvents Emulation (from Patchright)
             patches.append(COALESCED_EVENTS_PATCH)
 
         else:
-            # Default patches without fingerprint
-            patches.append(LANGUAGES_PATCH)
-            patches.append(HARDWARE_CONCURRENCY_PATCH.replace("{concurrency}", "8"))
-            patches.append(DEVICE_MEMORY_PATCH.replace("{memory}", "8"))
-            patches.append(WEBRTC_DISABLE_PATCH)  # Block WebRTC by default
-
-            # Add default Input Leak Fix
-            patches.append(
-                INPUT_LEAK_FIX_PATCH
-                .replace("{chrome_offset_x}", "0")
-                .replace("{chrome_offset_y}", "85")
-                .replace("{jitter}", "2")
-            )
-
-            # CoalescedEvents
-            patches.append(COALESCED_EVENTS_PATCH)
+            patches.extend(_DEFAULT_PATCHES)
 
         return patches
 
     def get_combined_patch(self) -> str:
-        """Get all patches combined into a single script."""
-        return "\n".join(self.get_all_patches())
+        """Get all patches combined into a single script.
+
+        The script only depends on the fingerprint, so it is built on
+        first use and reused for every page it is applied to.
+        """
+        if self._combined is None:
+            self._combined = "\n".join(self.get_all_patches())
+        return self._combined
 
     async def apply_to_page(self, cdp_session: Any) -> None:
         """Apply all patches to a CDP session before page loads.
 
+        The patches are registered as one script in the main world, where
+        page scripts can see them, and also run against the document that
+        is already loaded.
+
         Args:
             cdp_session: CDP session with send() method
         """
-        combined = self.get_combined_patch()
         await cdp_session.send(
             "Page.addScriptToEvaluateOnNewDocument",
-            {"source": combined}
+            {"source": self.get_combined_patch(), "runImmediately": True}
         )
 
     @staticmethod
@@ -1460,10 +1560,9 @@ class CDPPatches:
         Args:
             cdp_session: CDP session with send() method
         """
-        combined = "\n".join(CDPPatches.get_base_patches())
         await cdp_session.send(
             "Page.addScriptToEvaluateOnNewDocument",
-            {"source": combined}
+            {"source": _BASE_COMBINED, "runImmediately": True}
         )
 
 
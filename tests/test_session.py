@@ -0,0 +1,572 @@
+"""Tests for session module."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, MagicMock, patch
+from urllib.parse import parse_qsl
+
+import pytest
+from curl_cffi.requests import Cookies
+
+from kuromi_browser.session import Response, Session, SessionPool
+
+
+def make_raw_response(status_code=200, text="", url="https://example.com/"):
+    """Create a mock curl_cffi response."""
+    raw = MagicMock()
+    raw.status_code = status_code
+    raw.text = text
+    raw.content = text.encode()
+    raw.encoding = "utf-8"
+    raw.cookies = Cookies()
+    raw.headers = {}
+    raw.url = url
+    return raw
+
+
+def make_client(raw=None, cookies=None):
+    """Create a mock curl_cffi AsyncSession.
+
+    ``cookies`` stand in for what curl's jar has collected from servers.
+    """
+    client = MagicMock()
+    client.cookies = cookies if isinstance(cookies, Cookies) else Cookies(cookies)
+    client.request = AsyncMock(return_value=raw or make_raw_response())
+    client.close = AsyncMock()
+    return client
+
+
+class _CookieHandler(BaseHTTPRequestHandler):
+    """Serve /set?name=value, /redirect?to=path&name=value and /echo.
+
+    Query parameters of /set and /redirect are sent back as cookies, and
+    every response body is the Cookie header of the request.
+    """
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        params = dict(parse_qsl(query))
+        if path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", params.pop("to"))
+        else:
+            self.send_response(200)
+        if path in ("/set", "/redirect"):
+            for name, value in params.items():
+                self.send_header("Set-Cookie", f"{name}={value}; Path=/")
+        body = (self.headers.get("Cookie") or "").encode()
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def cookie_server():
+    """Run _CookieHandler on a local port and yield its localhost URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CookieHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://localhost:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def sent_cookies(response):
+    """Parse the Cookie header echoed back by _CookieHandler."""
+    return dict(pair.split("=", 1) for pair in response.text.split("; ") if pair)
+
+
+class TestSessionPool:
+    """Tests for SessionPool."""
+
+    @pytest.mark.asyncio
+    async def test_gather_uses_single_session(self):
+        """Test that gather issues all requests through one client."""
+        pool = SessionPool(pool_size=3)
+        session = await pool.acquire()
+        client = make_client()
+        session._client = client
+        await pool.release(session)
+
+        responses = await pool.gather([
+            ("GET", "https://example.com/a"),
+            ("POST", "https://example.com/b", {"data": "x"}),
+        ])
+
+        assert len(responses) == 2
+        assert all(isinstance(r, Response) for r in responses)
+        assert client.request.await_count == 2
+        methods = [c.kwargs["method"] for c in client.request.await_args_list]
+        assert methods == ["GET", "POST"]
+        assert client.request.await_args_list[1].kwargs["data"] == "x"
+        assert pool.size == 1
+        assert pool.available_count == 1
+
+    @pytest.mark.asyncio
+    async def test_gather_closes_temporary_session(self):
+        """Test that gather closes the untracked session of a full pool."""
+        pool = SessionPool(pool_size=1)
+        await pool.acquire()  # Keep the only pooled session busy
+
+        client = make_client()
+
+        async def ensure_client(session):
+            session._client = client
+            return client
+
+        with patch.object(Session, "_ensure_client", ensure_client):
+            await pool.gather([("GET", "https://example.com/")])
+
+        client.close.assert_awaited_once()
+        assert pool.size == 1
+        assert pool.available_count == 0
+
+    @pytest.mark.asyncio
+    async def test_gather_with_failing_request(self):
+        """Test fail-fast cancellation and return_exceptions in gather."""
+        import asyncio
+
+        cancelled = []
+
+        async def request(**kwargs):
+            if kwargs["url"].endswith("/bad"):
+                raise ConnectionError("boom")
+            if kwargs["url"].endswith("/slow"):
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(kwargs["url"])
+                    raise
+            return make_raw_response(url=kwargs["url"])
+
+        pool = SessionPool(pool_size=1)
+        session = await pool.acquire()
+        session._client = client = make_client()
+        client.request = AsyncMock(side_effect=request)
+        await pool.release(session)
+
+        with pytest.raises(ConnectionError):
+            await pool.gather([
+                ("GET", "https://example.com/slow"),
+                ("GET", "https://example.com/bad"),
+            ])
+        assert cancelled == ["https://example.com/slow"]
+        assert pool.available_count == 1
+
+        ok, failed = await pool.gather(
+            [("GET", "https://example.com/ok"), ("GET", "https://example.com/bad")],
+            return_exceptions=True,
+        )
+        assert isinstance(ok, Response) and ok.url == "https://example.com/ok"
+        assert isinstance(failed, ConnectionError)
+
+    @pytest.mark.asyncio
+    async def test_gather_empty(self):
+        """Test that gather with no requests creates no sessions."""
+        pool = SessionPool()
+        assert await pool.gather([]) == []
+        assert pool.size == 0
+
+    @pytest.mark.asyncio
+    async def test_released_response_is_reused(self):
+        """Test that released responses are recycled by pool sessions."""
+        pool = SessionPool(pool_size=1)
+        session = await pool.acquire()
+        session._client = make_client(make_raw_response(text="first"))
+
+        first = await session.get("https://example.com/")
+        assert first.text == "first"
+        first.release()
+        assert pool._response_pool
+
+        session._client = make_client(make_raw_response(text="second"))
+        second = await session.get("https://example.com/")
+        assert second is first
+        assert second.text == "second"
+        assert not pool._response_pool
+
+        # A reused wrapper can be released again, but only once per use
+        second.release()
+        second.release()
+        assert len(pool._response_pool) == 1
+
+    @pytest.mark.asyncio
+    async def test_close_all_survives_failing_session(self):
+        """Test that close_all closes every session even if one fails."""
+        pool = SessionPool(pool_size=2)
+        first = await pool.acquire()
+        second = await pool.acquire()
+        first._client = make_client()
+        first._client.close.side_effect = OSError("socket error")
+        second._client = client = make_client()
+
+        await pool.close_all()
+
+        client.close.assert_awaited_once()
+        assert pool.size == 0
+
+class TestResponse:
+    """Tests for Response wrapper."""
+
+    def test_release_without_pool_is_noop(self):
+        """Test that release() leaves standalone responses usable."""
+        response = Response(make_raw_response(text="body"))
+        response.release()
+        assert response.text == "body"
+
+    def test_no_instance_dict(self):
+        """Test that Response uses __slots__."""
+        response = Response(make_raw_response())
+        assert not hasattr(response, "__dict__")
+
+
+class TestSession:
+    """Tests for Session."""
+
+    def test_no_instance_dict(self):
+        """Test that Session and SessionPool use __slots__."""
+        assert not hasattr(Session(), "__dict__")
+        assert not hasattr(SessionPool(), "__dict__")
+
+    @pytest.mark.asyncio
+    async def test_cookie_index_is_view_over_client_jar(self):
+        """Test that server cookies are indexed by domain but sent by curl."""
+        jar = Cookies()
+        jar.set("sid", "1", domain=".www.example.com")
+        jar.set("pref", "2", domain="cdn.shop.co.uk")
+        session = Session()
+        session._client = make_client(cookies=jar)
+        await session.set_cookies({"global": "g"})
+
+        assert session._cookie_jar == {
+            "": {"global": "g"},
+            "example.com": {"sid": "1"},
+            "shop.co.uk": {"pref": "2"},
+        }
+        assert session.cookies == {"global": "g", "sid": "1", "pref": "2"}
+
+        await session.get("https://other.org/", cookies={"extra": "e"})
+        sent = session._client.request.await_args.kwargs["cookies"]
+        assert sent == {"global": "g", "extra": "e"}
+        # curl's jar is left in place for the next request
+        assert len(jar.jar) == 2
+
+    def test_registered_domain(self):
+        """Test cookie index key derivation."""
+        from kuromi_browser.session.client import _registered_domain
+
+        assert _registered_domain("www.example.com") == "example.com"
+        assert _registered_domain(".example.com") == "example.com"
+        assert _registered_domain("localhost") == "localhost"
+        assert _registered_domain("127.0.0.1") == "127.0.0.1"
+        assert _registered_domain("shop.example.co.uk") == "example.co.uk"
+        assert _registered_domain("co.uk") == "co.uk"
+
+    @pytest.mark.asyncio
+    async def test_server_cookies_round_trip(self, cookie_server):
+        """Test that a Set-Cookie from a dotless host is sent back."""
+        async with Session(http_version=None) as session:
+            await session.get(f"{cookie_server}/set?sid=abc")
+            response = await session.get(f"{cookie_server}/echo")
+            assert sent_cookies(response) == {"sid": "abc"}
+            assert session.cookies == {"sid": "abc"}
+
+            await session.delete_cookie("sid")
+            response = await session.get(f"{cookie_server}/echo")
+            assert sent_cookies(response) == {}
+
+    @pytest.mark.asyncio
+    async def test_redirect_cookies_kept(self, cookie_server):
+        """Test that cookies set on a redirect hop are kept and sent."""
+        async with Session(http_version=None) as session:
+            response = await session.get(f"{cookie_server}/redirect?to=/echo&hop=1")
+            assert sent_cookies(response) == {"hop": "1"}
+
+            response = await session.get(f"{cookie_server}/echo")
+            assert sent_cookies(response) == {"hop": "1"}
+
+    @pytest.mark.asyncio
+    async def test_gather_keeps_concurrent_cookies(self, cookie_server):
+        """Test that concurrent requests do not drop each other's cookies."""
+        pool = SessionPool(pool_size=1, http_version=None)
+        try:
+            await pool.gather(
+                [("GET", f"{cookie_server}/set?c{i}={i}") for i in range(8)]
+            )
+            [response] = await pool.gather([("GET", f"{cookie_server}/echo")])
+            assert sent_cookies(response) == {f"c{i}": str(i) for i in range(8)}
+        finally:
+            await pool.close_all()
+
+    @pytest.mark.asyncio
+    async def test_cookies_property_is_snapshot(self):
+        """Test that the cookies property returns a detached copy."""
+        session = Session()
+        await session.set_cookies({"a": "1"})
+        snapshot = session.cookies
+        snapshot["a"] = "changed"
+        await session.set_cookies({"b": "2"})
+        assert snapshot == {"a": "changed"}
+        assert session.cookies == {"a": "1", "b": "2"}
+
+    @pytest.mark.asyncio
+    async def test_sync_cookies_from_browser(self):
+        """Test syncing both Cookie models and CDP cookie dicts."""
+        from kuromi_browser.models import Cookie
+
+        session = Session()
+        page = MagicMock()
+        page.get_cookies = AsyncMock(
+            return_value=[Cookie(name="a", value="1", domain="example.com")]
+        )
+        await session.sync_cookies_from_browser(page)
+
+        page.get_cookies = AsyncMock(return_value=[{"name": "b", "value": "2"}])
+        await session.sync_cookies_from_browser(page)
+
+        page.get_cookies = AsyncMock(return_value=[])
+        await session.sync_cookies_from_browser(page)
+
+        assert session.cookies == {"a": "1", "b": "2"}
+
+    @pytest.mark.asyncio
+    async def test_get_merges_headers(self):
+        """Test that get() merges session and request headers."""
+        session = Session()
+        session._client = make_client()
+        session.set_header("User-Agent", "ua")
+
+        await session.get("https://example.com/", headers={"Accept": "*/*"})
+        call = session._client.request.await_args.kwargs
+        assert call["method"] == "GET"
+        assert call["headers"] == {"User-Agent": "ua", "Accept": "*/*"}
+        assert session.headers == {"User-Agent": "ua"}
+
+    def test_headers_property_is_readonly_view(self):
+        """Test that headers returns a live, read-only view."""
+        session = Session()
+        headers = session.headers
+        session.set_header("X-Test", "1")
+        assert headers["X-Test"] == "1"
+        with pytest.raises(TypeError):
+            headers["X-Test"] = "2"  # type: ignore[index]
+
+    @pytest.mark.asyncio
+    async def test_cookie_changes_update_client_jar(self):
+        """Test that deleting and clearing cookies also affects curl's jar."""
+        jar = Cookies()
+        jar.set("a", "server", domain="example.com")
+        jar.set("c", "3", domain="example.com")
+        session = Session()
+        session._client = make_client(cookies=jar)
+
+        await session.set_cookies({"a": "1", "b": "2"})
+        await session.delete_cookie("a")
+        assert session.get_cookies() == {"b": "2", "c": "3"}
+        await session.clear_cookies()
+        assert session.get_cookies() == {}
+        assert not jar.jar
+
+    @pytest.mark.asyncio
+    async def test_client_keeps_curl_cookies(self):
+        """Test that curl's jar records cookies, including redirect hops."""
+        session = Session()
+        client = await session._ensure_client()
+        try:
+            assert client.discard_cookies is False
+        finally:
+            await session.close()
+
+    def test_invalid_http_version(self):
+        """Test that unsupported HTTP versions are rejected."""
+        with pytest.raises(ValueError):
+            Session(http_version="h9")
+
+    @pytest.mark.asyncio
+    async def test_http_version_passed_to_client(self):
+        """Test that http_version maps to curl_cffi's CurlHttpVersion."""
+        from curl_cffi.const import CurlHttpVersion
+
+        session = Session(http_version="h2")
+        client = await session._ensure_client()
+        try:
+            assert client.http_version == CurlHttpVersion.V2TLS
+        finally:
+            await session.close()
+
+
+HTML = """<html><head><title>Test Page</title>
+<meta name="description" content="A test page"></head>
+<body><div id="main" class="content active">
+<a href="/one">One</a><a href="/two">Two</a><a>No link</a>
+<img src="a.png"><p class="note">It's here</p>
+</div></body></html>"""
+
+
+class TestSessionElement:
+    """Tests for session.SessionElement selectors."""
+
+    @pytest.fixture
+    def response(self):
+        return Response(make_raw_response(text=HTML))
+
+    def test_css_and_xpath(self, response):
+        """Test CSS and XPath queries through compiled selectors."""
+        assert [el.text for el in response.css("a[href]")] == ["One", "Two"]
+        assert len(response.xpath("//a")) == 3
+        assert response.ele("x://div").id == "main"
+        assert response.ele("#main").has_class("active")
+
+    def test_compiled_selectors_are_cached(self, response):
+        """Test that repeated selectors reuse the compiled object."""
+        from kuromi_browser.session.element import _compiled_css
+
+        response.eles("css:div p")
+        before = _compiled_css.cache_info().hits
+        response.eles("css:div p")
+        assert _compiled_css.cache_info().hits == before + 1
+
+    def test_links_and_images(self, response):
+        """Test href/src extraction."""
+        assert response.links() == ["/one", "/two"]
+        assert response.images() == ["a.png"]
+        assert response.body.links() == ["/one", "/two"]
+
+    def test_text_and_attr_selectors_escape_quotes(self, response):
+        """Test that text/attr values with quotes are matched literally."""
+        assert response.ele("text:It's here").tag == "p"
+        assert response.ele("@id=main").tag == "div"
+        assert response.ele("@class=\"note\"").text == "It's here"
+        assert response.eles("@bad name=x") == []
+
+    def test_document_accessors_are_memoized(self, response):
+        """Test that title/body/meta are computed once per response."""
+        assert response.title == "Test Page"
+        assert response.body is response.body
+        assert response.forms() == response.forms() == []
+        assert response.meta("description") == "A test page"
+        assert "meta:description" in response._cache
+
+        # Each call gets its own list, so changing one does not stick
+        metas = response.meta()
+        assert metas and metas == response.meta()
+        metas.clear()
+        assert response.meta() == response._cache["meta"] != []
+
+    @pytest.mark.parametrize(
+        "selector,expected",
+        [
+            ("css:div > p", ("css", "div > p")),
+            ("c: div", ("css", "div")),
+            ("canvas", ("css", "canvas")),
+            ("xpath://a", ("xpath", "//a")),
+            ("x:.//a", ("xpath", ".//a")),
+            ("text: Hello", ("text", "Hello")),
+            ("t:Hi", ("text", "Hi")),
+            ("table tr", ("css", "table tr")),
+            ("//div", ("xpath", "//div")),
+            ("/html", ("css", "/html")),
+            ("(//a)[1]", ("xpath", "(//a)[1]")),
+            ("./span", ("xpath", "./span")),
+            (".note", ("css", ".note")),
+            ("@id=main", ("attr", "id=main")),
+            ("@id", ("css", "@id")),
+            ("#main", ("css", "#main")),
+            ("  div  ", ("css", "div")),
+            ("", ("css", "")),
+        ],
+    )
+    def test_parse_selector(self, selector, expected):
+        """Test selector prefix detection."""
+        from kuromi_browser.session.element import _parse_selector
+
+        assert _parse_selector(selector) == expected
+
+    def test_plain_etree_elements_are_wrapped(self):
+        """Test wrapping elements that cannot cache a wrapper."""
+        from lxml import etree
+
+        from kuromi_browser.session.element import SessionElement
+
+        root = SessionElement(etree.fromstring("<a><b/><b/></a>"))
+        assert [child.tag for child in root.children] == ["b", "b"]
+
+    def test_attrs_returns_copy(self, response):
+        """Test that mutating attrs does not change the element."""
+        main = response.ele("#main")
+        main.attrs["id"] = "other"
+        assert main.attrs["id"] == "main"
+        assert main.attr("id") == "main"
+
+    def test_tree_parses_bytes_with_response_encoding(self):
+        """Test that the tree is parsed from content in its encoding."""
+        raw = make_raw_response()
+        raw.content = "<p>caf\xe9</p>".encode("latin-1")
+        raw.encoding = "latin-1"
+        assert Response(raw).ele("p").text == "caf\xe9"
+
+    def test_inner_html(self):
+        """Test inner HTML serialization."""
+        from lxml import html
+
+        from kuromi_browser.session.element import SessionElement
+
+        el = SessionElement(
+            html.fromstring('<div title="a>b">t<p class="x">1</p>tail<br>z</div>')
+        )
+        assert el.inner_html == 't<p class="x">1</p>tail<br>z'
+        assert SessionElement(html.fromstring("<p></p>")).inner_html == ""
+        assert el.children[0].inner_html == "1"
+        assert SessionElement(html.fromstring("<p>a &lt; b</p>")).inner_html == "a &lt; b"
+
+    def test_json_parses_raw_content(self):
+        """Test JSON parsing from bytes and with stdlib kwargs."""
+        import json
+
+        raw = make_raw_response(text='{"price": 1.5, "name": "caf\\u00e9"}')
+        assert Response(raw).json() == {"price": 1.5, "name": "caf\xe9"}
+
+        from decimal import Decimal
+
+        data = Response(raw).json(parse_float=Decimal)
+        assert data["price"] == Decimal("1.5")
+
+        with pytest.raises(json.JSONDecodeError):
+            Response(make_raw_response(text="not json")).json()
+
+    def test_json_accepts_stdlib_only_values(self):
+        """Test that NaN and big integers parse with or without orjson."""
+        import math
+
+        body = '{"big": 123456789012345678901234567890, "nan": NaN, "inf": -Infinity}'
+        data = Response(make_raw_response(text=body)).json()
+        assert data["big"] == 123456789012345678901234567890
+        assert math.isnan(data["nan"])
+        assert data["inf"] == -math.inf
+
+    def test_element_no_instance_dict(self, response):
+        """Test that SessionElement uses __slots__."""
+        assert not hasattr(response.body, "__dict__")
+
+    def test_response_links_are_unique(self):
+        """Test that Response.links() drops repeated hrefs."""
+        response = Response(
+            make_raw_response(text='<a href="/b">1</a><a href="/a">2</a><a href="/b">3</a>')
+        )
+        assert response.links() == ["/b", "/a"]
+        assert response._root().links() == ["/b", "/a", "/b"]
+
+    def test_xpath_skips_non_element_results(self, response):
+        """Test that attribute/text XPath results are not wrapped."""
+        assert response.eles("x://a/@href") == []
+        assert response.xpath("//a/text()") == []
+
+    def test_text_search_checks_all_text_nodes(self):
+        """Test that text: matches text after a child element."""
+        response = Response(
+            make_raw_response(text="<div><p>Price<b>:</b> 10 USD</p></div>")
+        )
+        assert [el.tag for el in response.eles("text:10 USD")] == ["p"]
@@ -0,0 +1,691 @@
+"""
+Tests for kuromi-browser stealth patches.
+
+Run with: pytest tests/test_stealth.py -v
+"""
+
+import asyncio
+import json
+import shutil
+import subprocess
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from kuromi_browser.stealth import StealthPatches
+from kuromi_browser.stealth.cdp import CDPPatches
+from kuromi_browser.stealth.behavior.keyboard import (
+    _DELAY_FACTORS,
+    TYPING_SPEED_FAST,
+    HumanKeyboard,
+    _get_adjacent_keys,
+    _key_distance,
+)
+from kuromi_browser.stealth.behavior.mouse import HumanMouse, Point, _ease_speed_factors
+from kuromi_browser.stealth.fingerprint import FingerprintGenerator
+
+
+@pytest.fixture
+def fingerprint():
+    return FingerprintGenerator().generate(seed=42)
+
+
+requires_node = pytest.mark.skipif(
+    shutil.which("node") is None, reason="node is not installed"
+)
+
+# Globals the patches expect from a page; report() hands a value back
+_JS_PRELUDE = """
+globalThis.window = globalThis;
+Object.defineProperty(globalThis, 'navigator', { value: {}, configurable: true });
+const report = (value) => process.stdout.write(JSON.stringify(value));
+"""
+
+# 4x4 canvas of identical RGBA pixels; reads counts full-canvas pixel reads
+_CANVAS_STUBS = """
+let reads = 0;
+globalThis.CanvasRenderingContext2D = class {
+    constructor(canvas, pixel) {
+        this.canvas = canvas;
+        this.pixels = new Uint8ClampedArray(64).map((_, i) => pixel[i % 4]);
+    }
+    getImageData() { reads++; return { data: new Uint8ClampedArray(this.pixels) }; }
+    putImageData(imageData) { this.pixels = new Uint8ClampedArray(imageData.data); }
+    fillRect(x, y, w, h) {}
+};
+globalThis.HTMLCanvasElement = class {
+    constructor(rgb) {
+        this.size = { width: 4, height: 4 };
+        this.context = new CanvasRenderingContext2D(this, [...rgb, 255]);
+    }
+    get width() { return this.size.width; }
+    set width(value) { this.size.width = value; }
+    get height() { return this.size.height; }
+    set height(value) { this.size.height = value; }
+    getContext() { return this.context; }
+    toDataURL() { return Array.from(this.context.pixels); }
+    toBlob(callback) { callback(null); }
+};
+"""
+
+
+def run_js(script: str) -> Any:
+    """Run a script in node and return the value it passed to report()."""
+    result = subprocess.run(
+        ["node", "-"],
+        input=_JS_PRELUDE + script,
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+class TestStealthPatches:
+    """Test StealthPatches class."""
+
+    def test_fingerprint_patches_rendered(self, fingerprint):
+        """Test that templates are filled from the fingerprint."""
+        patches = StealthPatches(fingerprint)
+
+        webgl = patches.patch_webgl()
+        assert fingerprint.webgl.vendor in webgl
+        assert "{vendor}" not in webgl and "{renderer}" not in webgl
+        assert "{seed}" not in patches.patch_canvas()
+        assert "{seed}" not in patches.patch_audio()
+
+    def test_patches_rendered_once(self, fingerprint):
+        """Test that repeated calls return the same rendered string."""
+        patches = StealthPatches(fingerprint)
+        assert patches.patch_canvas() is patches.patch_canvas()
+
+    def test_combined_patch_built_once(self, fingerprint):
+        """Test that the init script is built once and reused."""
+        patches = StealthPatches(fingerprint)
+        script = patches.generate_patches()
+        assert script
+        assert patches.get_init_script() is script
+
+    def test_static_patches(self):
+        """Test that static patches are returned from the shared constants."""
+        from kuromi_browser.stealth.cdp.patches import WEBDRIVER_PATCH
+
+        patches = StealthPatches()
+        assert patches.patch_webdriver() is WEBDRIVER_PATCH
+        assert patches.patch_navigator_plugins()
+
+    def test_patches_minified(self):
+        """Test that patch scripts ship without indentation or comments."""
+        script = StealthPatches().generate_patches()
+        lines = script.split("\n")
+        assert all(line and line == line.strip() for line in lines)
+        assert not any(line.startswith("//") for line in lines)
+
+    def test_no_fingerprint(self):
+        """Test defaults without a fingerprint."""
+        patches = StealthPatches()
+        assert patches.patch_webgl() == ""
+        assert "Date.now()" in patches.patch_canvas()
+
+
+class TestStealthConfig:
+    """Test StealthConfig dataclass."""
+
+    def test_defaults_and_hashing(self):
+        """Test that configs compare and hash by value."""
+        from kuromi_browser.stealth import StealthConfig
+
+        config = StealthConfig(timezone=False)
+        assert config.webdriver and not config.timezone
+        assert config == StealthConfig(timezone=False)
+        assert hash(config) == hash(StealthConfig(timezone=False))
+
+    def test_immutable(self):
+        """Test that fields cannot be reassigned."""
+        from dataclasses import FrozenInstanceError
+
+        from kuromi_browser.stealth import StealthConfig
+
+        with pytest.raises(FrozenInstanceError):
+            StealthConfig().webdriver = False
+
+
+class TestApplyStealth:
+    """Test apply_stealth function."""
+
+    @pytest.mark.asyncio
+    async def test_sends_overrides(self, fingerprint):
+        """Test that script and emulation overrides are all sent."""
+        from kuromi_browser.stealth import StealthConfig, apply_stealth
+
+        session = AsyncMock()
+        await apply_stealth(session, fingerprint)
+        methods = {call.args[0] for call in session.send.await_args_list}
+        assert methods == {
+            "Page.addScriptToEvaluateOnNewDocument",
+            "Emulation.setUserAgentOverride",
+            "Emulation.setLocaleOverride",
+            "Emulation.setTimezoneOverride",
+        }
+
+        session = AsyncMock()
+        await apply_stealth(session, fingerprint, StealthConfig(timezone=False))
+        methods = [call.args[0] for call in session.send.await_args_list]
+        assert "Emulation.setTimezoneOverride" not in methods
+
+
+class TestHumanKeyboard:
+    """Test HumanKeyboard timing helpers."""
+
+    def test_key_distance(self):
+        """Test distances between keys, including off-layout keys."""
+        assert _key_distance("a", "a") == 0
+        assert _key_distance("q", "A") == 1.0
+        assert _key_distance("a", "d") == 2.0
+        assert _key_distance("Backspace", "h") == 0
+
+    def test_adjacent_keys(self):
+        """Test neighbour lookup on the QWERTY layout."""
+        adjacent = _get_adjacent_keys("S")
+        assert set(adjacent) == {"q", "w", "e", "a", "d", "z", "x", "c"}
+        assert not _get_adjacent_keys("Enter")
+
+    def test_generate_timing(self):
+        """Test one timing entry per character within the clamp."""
+        timings = HumanKeyboard.generate_timing("hello world")
+        assert "".join(t.key for t in timings) == "hello world"
+        for timing in timings:
+            assert HumanKeyboard.MIN_DELAY <= timing.delay_before
+            assert timing.delay_before <= HumanKeyboard.MAX_DELAY * 3
+            assert HumanKeyboard.HOLD_MIN <= timing.hold_duration <= HumanKeyboard.HOLD_MAX
+
+    def test_generate_timing_typos(self):
+        """Test that every typo is followed by a correction."""
+        with patch.object(HumanKeyboard, "TYPO_PROBABILITY", 1.0):
+            timings = HumanKeyboard.generate_timing("asd", include_typos=True)
+
+        keys = [t.key for t in timings]
+        assert keys[1::3] == ["Backspace"] * 3
+        assert keys[2::3] == ["a", "s", "d"]
+        assert keys[0] in _get_adjacent_keys("a")
+
+    def test_generate_timing_seeded(self):
+        """Test that seeded timings are reproducible and cached."""
+        first = HumanKeyboard.generate_timing("hello", include_typos=True, seed=7)
+        second = HumanKeyboard.generate_timing("hello", include_typos=True, seed=7)
+        assert first == second
+        assert first[0] is second[0]
+
+    @pytest.mark.asyncio
+    async def test_type_text_event_order(self):
+        """Test that every keyDown is released before the next one."""
+        cdp_session = AsyncMock()
+        real_sleep = asyncio.sleep
+
+        with patch("asyncio.sleep", new=lambda _: real_sleep(0)):
+            await HumanKeyboard.type_text(cdp_session, "abc")
+
+        events = [
+            (c.args[1]["type"], c.args[1]["key"])
+            for c in cdp_session.send.call_args_list
+        ]
+        assert events == [
+            ("keyDown", "a"), ("keyUp", "a"),
+            ("keyDown", "b"), ("keyUp", "b"),
+            ("keyDown", "c"), ("keyUp", "c"),
+        ]
+
+    def test_uppercase_uses_layout_distance(self):
+        """Test that uppercase letters share their lowercase position."""
+        assert _key_distance("Q", "s") == _key_distance("q", "s")
+        assert _DELAY_FACTORS[("H", "i")] == _DELAY_FACTORS[("h", "i")]
+
+    @pytest.mark.asyncio
+    async def test_type_text_insert_text(self):
+        """Test that insert_text uses one insertText call."""
+        cdp_session = AsyncMock()
+        await HumanKeyboard.type_text(cdp_session, "hello", insert_text=True)
+
+        cdp_session.send.assert_awaited_once_with("Input.insertText", {"text": "hello"})
+
+    @pytest.mark.asyncio
+    async def test_type_text_fast_speed_sends_key_events(self):
+        """Test that fast typing still sends key events by default."""
+        cdp_session = AsyncMock()
+        real_sleep = asyncio.sleep
+
+        with patch("asyncio.sleep", new=lambda _: real_sleep(0)):
+            await HumanKeyboard.type_text(cdp_session, "hi", speed=TYPING_SPEED_FAST)
+
+        methods = {c.args[0] for c in cdp_session.send.call_args_list}
+        assert methods == {"Input.dispatchKeyEvent"}
+
+    @pytest.mark.asyncio
+    async def test_press_key_maps_special_keys(self):
+        """Test that named keys are sent with their CDP text."""
+        cdp_session = AsyncMock()
+        await HumanKeyboard.press_key(cdp_session, "Enter", hold_duration=0)
+
+        key_down = cdp_session.send.call_args_list[0].args[1]
+        assert key_down == {"type": "keyDown", "key": "Enter", "text": "\r"}
+
+    @pytest.mark.asyncio
+    async def test_press_combination_modifiers(self):
+        """Test that modifiers are combined into one bit mask."""
+        cdp_session = AsyncMock()
+        with patch("asyncio.sleep", new=AsyncMock()):
+            await HumanKeyboard.press_combination(cdp_session, "Ctrl", "Shift", "v")
+
+        events = [c.args[1] for c in cdp_session.send.call_args_list]
+        assert [(e["type"], e["key"]) for e in events] == [
+            ("keyDown", "Ctrl"), ("keyDown", "Shift"), ("keyDown", "v"),
+            ("keyUp", "v"), ("keyUp", "Shift"), ("keyUp", "Ctrl"),
+        ]
+        assert events[2]["modifiers"] == 2 | 8
+
+
+class TestHumanMouse:
+    """Test HumanMouse path generation."""
+
+    def test_point_distance(self):
+        """Test Euclidean distance between points."""
+        assert Point(0, 0).distance_to(Point(3, 4)) == 5.0
+
+    def test_bezier_point(self):
+        """Test cubic evaluation at the ends and the midpoint."""
+        p0, p1, p2, p3 = Point(0, 0), Point(0, 100), Point(100, 100), Point(100, 0)
+        assert tuple(HumanMouse.bezier_point(0, p0, p1, p2, p3)) == (0, 0)
+        assert tuple(HumanMouse.bezier_point(1, p0, p1, p2, p3)) == (100, 0)
+        assert tuple(HumanMouse.bezier_point(0.5, p0, p1, p2, p3)) == (50, 75)
+
+    def test_bezier_curve_endpoints(self):
+        """Test that curves start and end exactly on the given points."""
+        points = HumanMouse.bezier_curve((10, 20), (300, 400), num_points=30)
+        assert len(points) == 30
+        assert points[0] == (10, 20)
+        assert points[-1] == (300, 400)
+        assert all(isinstance(c, int) for point in points for c in point)
+
+    def test_bezier_curve_stays_in_bounds(self):
+        """Test that zero deviation keeps samples inside the bounding box."""
+        points = HumanMouse.bezier_curve(
+            (0, 0), (200, 100), num_points=21, control_deviation=(0, 0)
+        )
+        assert all(0 <= x <= 200 and 0 <= y <= 100 for x, y in points)
+
+    def test_generate_path(self):
+        """Test that paths keep their endpoints and have one duration per segment."""
+        path = HumanMouse.generate_path((0, 0), (400, 300), speed=500)
+        assert tuple(path.points[0]) == (0, 0)
+        assert tuple(path.points[-1]) == (400, 300)
+        assert len(path.durations) == len(path) - 1
+        assert all(d >= 0.001 for d in path.durations)
+        assert path.total_duration == sum(path.durations)
+
+    def test_generate_path_with_overshoot(self):
+        """Test that an overshooting path still ends on the target."""
+        path = HumanMouse.generate_path((0, 0), (400, 300), with_overshoot=True)
+        assert tuple(path.points[-1]) == (400, 300)
+        assert len(path.durations) == len(path) - 1
+
+    def test_ease_speed_factors_accelerate(self):
+        """Test that segment speed starts slow and rises to the end."""
+        factors = _ease_speed_factors(10)
+        assert factors[0] == 0.5
+        assert all(a < b for a, b in zip(factors, factors[1:]))
+        assert factors[-1] < 1.5
+
+    @pytest.mark.asyncio
+    async def test_move_sends_every_point_in_order(self):
+        """Test that pipelined moves are all sent, in path order."""
+        cdp_session = AsyncMock()
+        real_sleep = asyncio.sleep
+
+        with patch("asyncio.sleep", new=lambda _: real_sleep(0)):
+            await HumanMouse.move(cdp_session, (0, 0), (300, 200), speed=500)
+
+        events = [c.args[1] for c in cdp_session.send.call_args_list]
+        assert all(e["type"] == "mouseMoved" for e in events)
+        assert (events[0]["x"], events[0]["y"]) == (0, 0)
+        assert (events[-1]["x"], events[-1]["y"]) == (300, 200)
+
+
+class TestCDPPatches:
+    """Test CDPPatches script assembly."""
+
+    def test_combined_patch_cached(self, fingerprint):
+        """Test that the combined script is built once per instance."""
+        patches = CDPPatches(fingerprint)
+        script = patches.get_combined_patch()
+        assert patches.get_combined_patch() is script
+
+    @pytest.mark.asyncio
+    async def test_apply_basic_patches(self):
+        """Test that basic patches send the base scripts in one call."""
+        cdp_session = AsyncMock()
+        await CDPPatches.apply_basic_patches(cdp_session)
+
+        method, params = cdp_session.send.await_args.args
+        assert method == "Page.addScriptToEvaluateOnNewDocument"
+        assert params["source"] == "\n".join(CDPPatches.get_base_patches())
+        assert params["runImmediately"] is True
+
+    @pytest.mark.asyncio
+    async def test_apply_to_page_single_main_world_script(self, fingerprint):
+        """Test that all patches are sent once, in the page's main world."""
+        patches = CDPPatches(fingerprint)
+        cdp_session = AsyncMock()
+        await patches.apply_to_page(cdp_session)
+
+        cdp_session.send.assert_awaited_once()
+        method, params = cdp_session.send.await_args.args
+        assert method == "Page.addScriptToEvaluateOnNewDocument"
+        assert params["source"] is patches.get_combined_patch()
+        assert params["runImmediately"] is True
+        assert "worldName" not in params
+
+    def test_fill_leaves_js_braces(self):
+        """Test that placeholder substitution only touches known names."""
+        from kuromi_browser.stealth.cdp.patches import _fill
+
+        template = "((v) => { return {v}; })({value}); ${seed}{other}"
+        assert _fill(template, value=8, seed=1) == (
+            "((v) => { return {v}; })(8); $1{other}"
+        )
+
+    def test_plugin_data_embedded_as_json(self):
+        """Test that plugin data is shipped as a parseable JSON string."""
+        import json
+        import re
+
+        from kuromi_browser.stealth.cdp.patches import PLUGINS_PATCH, _PLUGIN_DATA
+
+        literal = re.search(r"JSON\.parse\((.*)\);", PLUGINS_PATCH).group(1)
+        assert json.loads(json.loads(literal)) == _PLUGIN_DATA
+
+    def test_base_patches_shared(self):
+        """Test that the base patches are an immutable shared tuple."""
+        base = CDPPatches.get_base_patches()
+        assert isinstance(base, tuple)
+        assert CDPPatches.get_base_patches() is base
+        assert CDPPatches().get_all_patches()[:len(base)] == list(base)
+
+
+@requires_node
+class TestPatchScripts:
+    """Run the patch scripts in node against minimal DOM stubs."""
+
+    @pytest.mark.parametrize("with_fingerprint", [True, False])
+    def test_combined_patch_parses(self, fingerprint, tmp_path, with_fingerprint):
+        """Test that the combined script is valid JavaScript."""
+        patches = CDPPatches(fingerprint if with_fingerprint else None)
+        script = tmp_path / "combined.js"
+        script.write_text(patches.get_combined_patch())
+
+        result = subprocess.run(
+            ["node", "--check", str(script)], capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+
+    def test_chrome_timing_reads_clock_once(self):
+        """Test that loadTimes() and csi() each read the clock once."""
+        from kuromi_browser.stealth.cdp.patches import CHROME_PATCHES
+
+        result = run_js(
+            """
+            let calls = 0;
+            Date.now = () => { calls++; return 1700000000000; };
+            Object.defineProperty(globalThis, 'performance', {
+                value: { timing: { navigationStart: 1699999999000 } },
+                configurable: true
+            });
+            """
+            + CHROME_PATCHES
+            + "report({ load: chrome.loadTimes(), csi: chrome.csi(), calls });"
+        )
+
+        assert result["calls"] == 2
+        load = result["load"]
+        assert load["firstPaintTime"] == load["commitLoadTime"] == 1700000000
+        assert load["finishLoadTime"] == load["finishDocumentLoadTime"] == 1700000000
+        assert result["csi"]["pageT"] == 1000
+
+    def test_canvas_noise(self):
+        """Test that canvas noise is seeded, saturating and applied once."""
+        from kuromi_browser.stealth.cdp.patches import CANVAS_NOISE_PATCH, _fill
+
+        script = (
+            _CANVAS_STUBS
+            + _fill(CANVAS_NOISE_PATCH, seed=42)
+            + """
+            const canvas = new HTMLCanvasElement([0, 128, 255]);
+            const first = canvas.toDataURL();
+            const again = canvas.toDataURL();
+            const readsBefore = reads;
+            canvas.getContext('2d').fillRect(0, 0, 1, 1);
+            canvas.toDataURL();
+            const readsAfterDraw = reads;
+            // Resetting the size clears the bitmap even when it is unchanged
+            canvas.width = canvas.width;
+            canvas.toDataURL();
+            canvas.height = 4;
+            canvas.getContext('2d').getImageData(0, 0, 4, 4);
+            report({ first, again, readsBefore, readsAfterDraw, reads });
+            """
+        )
+        result = run_js(script)
+
+        assert run_js(script)["first"] == result["first"]
+        pixels = result["first"]
+        assert pixels != [0, 128, 255, 255] * 16
+        assert all(0 <= value <= 255 for value in pixels)
+        # Reading an unchanged canvas again does not add more noise
+        assert result["again"] == pixels
+        assert result["readsBefore"] == 1
+        assert result["readsAfterDraw"] == 2
+        # The size resets noise again; getImageData adds its own read
+        assert result["reads"] == 5
+
+    def test_canvas_wrappers_look_native(self):
+        """Test that wrapped canvas methods keep name, length and source."""
+        from kuromi_browser.stealth.cdp.patches import (
+            CANVAS_NOISE_PATCH,
+            TOSTRING_PROTECTION_PATCH,
+            _fill,
+        )
+
+        result = run_js(
+            _CANVAS_STUBS
+            + """
+            const describe = () => {
+                const canvasProto = HTMLCanvasElement.prototype;
+                const contextProto = CanvasRenderingContext2D.prototype;
+                const widthSetter = Object.getOwnPropertyDescriptor(canvasProto, 'width').set;
+                return [
+                    contextProto.fillRect, contextProto.getImageData,
+                    canvasProto.toDataURL, widthSetter
+                ].map((fn) => [fn.name, fn.length, 'prototype' in fn, fn.toString()]);
+            };
+            const before = describe();
+            """
+            + TOSTRING_PROTECTION_PATCH
+            + _fill(CANVAS_NOISE_PATCH, seed=42)
+            + "report({ before, after: describe() });"
+        )
+
+        assert result["after"] == result["before"]
+        assert [name for name, *_ in result["after"]] == [
+            "fillRect", "getImageData", "toDataURL", "set width"
+        ]
+
+    def test_audio_noise(self):
+        """Test that byte frequency noise saturates instead of wrapping."""
+        from kuromi_browser.stealth.cdp.patches import AUDIO_NOISE_PATCH, _fill
+
+        result = run_js(
+            """
+            globalThis.AnalyserNode = class {
+                getByteFrequencyData(array) { array.fill(this.level); }
+                getFloatFrequencyData(array) { array.fill(0); }
+            };
+            globalThis.AudioBuffer = class {
+                getChannelData() { return new Float32Array(64); }
+            };
+            """
+            + _fill(AUDIO_NOISE_PATCH, seed=42)
+            + """
+            const bytes = (level) => {
+                const node = new AnalyserNode();
+                node.level = level;
+                const array = new Uint8Array(64);
+                node.getByteFrequencyData(array);
+                return Array.from(array);
+            };
+            const samples = Array.from(new AudioBuffer().getChannelData(0));
+            report({ low: bytes(0), high: bytes(255), samples });
+            """
+        )
+
+        assert set(result["low"]) == {0, 1}
+        assert set(result["high"]) == {255}
+        assert all(0 < abs(sample) < 0.0001 for sample in result["samples"])
+
+    def test_plugins(self):
+        """Test that navigator.plugins and mimeTypes behave like Chrome's."""
+        from kuromi_browser.stealth.cdp.patches import PLUGINS_PATCH, _PLUGIN_DATA
+
+        result = run_js(
+            """
+            for (const name of ['Plugin', 'PluginArray', 'MimeType', 'MimeTypeArray']) {
+                globalThis[name] = class {};
+            }
+            """
+            + PLUGINS_PATCH
+            + """
+            const plugins = navigator.plugins;
+            const mimeTypes = navigator.mimeTypes;
+            const iteratorTag = (o) => Object.prototype.toString.call(o[Symbol.iterator]());
+            report({
+                names: [...plugins].map((p) => p.name),
+                keys: Object.keys(plugins),
+                isPluginArray: plugins instanceof PluginArray,
+                named: plugins.namedItem(plugins[0].name) === plugins[0],
+                types: [...plugins[0]].map((m) => m.type),
+                mimeTypes: [...mimeTypes].map((m) => m.type),
+                enabledPlugin: mimeTypes[0].enabledPlugin === plugins[0],
+                byType: mimeTypes[mimeTypes[0].type] === mimeTypes[0],
+                iterators: [plugins, plugins[0], mimeTypes].map(iteratorTag),
+                pdfViewerEnabled: navigator.pdfViewerEnabled
+            });
+            """
+        )
+
+        names = [plugin["name"] for plugin in _PLUGIN_DATA]
+        assert result["names"] == names
+        # Named items are not enumerable, unlike the indices
+        indices = [str(i) for i in range(len(names))]
+        assert result["keys"][:len(names) + 1] == indices + ["length"]
+        assert not set(names) & set(result["keys"])
+        assert result["isPluginArray"] and result["named"]
+        assert result["types"] == [mt["type"] for mt in _PLUGIN_DATA[0]["mimeTypes"]]
+        assert result["mimeTypes"] == [
+            mt["type"] for plugin in _PLUGIN_DATA for mt in plugin["mimeTypes"]
+        ]
+        assert result["enabledPlugin"] and result["byType"]
+        assert result["iterators"] == ["[object Array Iterator]"] * 3
+        assert result["pdfViewerEnabled"] is True
+
+    def test_webgl_getparameter(self):
+        """Test that WebGL spoofing patches getParameter on the prototype."""
+        from kuromi_browser.stealth.cdp.patches import (
+            TOSTRING_PROTECTION_PATCH,
+            WEBGL_PATCH,
+            _fill,
+        )
+
+        result = run_js(
+            """
+            globalThis.WebGLRenderingContext = class {
+                getParameter(param) { return 'native ' + param; }
+            };
+            const original = WebGLRenderingContext.prototype.getParameter;
+            """
+            + TOSTRING_PROTECTION_PATCH
+            + _fill(WEBGL_PATCH, vendor="'Vendor'", renderer="'Renderer'")
+            + """
+            const gl = new WebGLRenderingContext();
+            const patched = WebGLRenderingContext.prototype.getParameter;
+            report({
+                vendor: gl.getParameter(37445),
+                renderer: gl.getParameter(37446),
+                other: gl.getParameter(7936),
+                same: gl.getParameter === patched,
+                name: patched.name,
+                hasPrototype: 'prototype' in patched,
+                source: patched.toString() === original.toString()
+            });
+            """
+        )
+
+        assert result == {
+            "vendor": "Vendor",
+            "renderer": "Renderer",
+            "other": "native 7936",
+            "same": True,
+            "name": "getParameter",
+            "hasPrototype": False,
+            "source": True,
+        }
+
+    def test_languages(self, fingerprint):
+        """Test that navigator.languages is one frozen fingerprint array."""
+        patch_source = next(
+            script for script in CDPPatches(fingerprint).get_all_patches()
+            if "navigator, 'languages'" in script
+        )
+
+        result = run_js(
+            patch_source
+            + """
+            report({
+                languages: navigator.languages,
+                language: navigator.language,
+                frozen: Object.isFrozen(navigator.languages),
+                same: navigator.languages === navigator.languages
+            });
+            """
+        )
+
+        assert result == {
+            "languages": list(fingerprint.navigator.languages),
+            "language": fingerprint.navigator.languages[0],
+            "frozen": True,
+            "same": True,
+        }
+
+    def test_timezone_copies_options(self):
+        """Test that the timezone patch leaves the caller's options alone."""
+        from kuromi_browser.stealth.cdp.patches import TIMEZONE_PATCH, _fill
+
+        result = run_js(
+            _fill(TIMEZONE_PATCH, timezone="'Asia/Tokyo'", offset=-540)
+            + """
+            const options = { hour: 'numeric' };
+            const format = new Intl.DateTimeFormat('en-US', options);
+            report({
+                options,
+                timeZone: format.resolvedOptions().timeZone,
+                explicit: new Intl.DateTimeFormat('en-US', { timeZone: 'UTC' })
+                    .resolvedOptions().timeZone,
+                offset: new Date().getTimezoneOffset()
+            });
+            """
+        )
+
+        assert result == {
+            "options": {"hour": "numeric"},
+            "timeZone": "Asia/Tokyo",
+            "explicit": "UTC",
+            "offset": -540,
+        }